@@ -0,0 +1,114 @@
+"""
+基准测试共用的工具：临时目录、测试文件生成和输出比较
+
+各基准测试中的一致性检查都写成可导入的函数，测试文件统一由这里生成，
+例如: python -c "from bench.smap_lr_overlay_bench import check; print(check(rows=2000))"
+"""
+
+import random
+import shutil
+import tempfile
+import zipfile
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+import openpyxl
+
+
+@contextmanager
+def workdir(prefix: str = "bench_") -> Iterator[str]:
+    """临时目录，结束后连同生成的文件一起删除"""
+    path = tempfile.mkdtemp(prefix=prefix)
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def read_values(path: str) -> Dict[str, list]:
+    """读取所有Sheet的值 {Sheet名: [行, ...]}"""
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return {ws.title: list(ws.iter_rows(values_only=True)) for ws in wb.worksheets}
+    finally:
+        wb.close()
+
+
+def zip_parts(path: str) -> Dict[str, bytes]:
+    """读取xlsx中除 docProps 外的所有部件（docProps 中有保存时间）"""
+    with zipfile.ZipFile(path) as zf:
+        return {
+            name: zf.read(name)
+            for name in zf.namelist()
+            if not name.startswith("docProps/")
+        }
+
+
+def different_parts(path1: str, path2: str) -> List[str]:
+    """两个xlsx中内容不同的部件名，字节完全一致时为空"""
+    parts1, parts2 = zip_parts(path1), zip_parts(path2)
+    return sorted(
+        name for name in parts1.keys() | parts2.keys() if parts1.get(name) != parts2.get(name)
+    )
+
+
+def make_smap_lr_file(
+    path: str, rows: int, cols: int, sheet2_headers: int = 1, sheet3_rows: int = 1
+) -> None:
+    """
+    smap_lr 的测试文件
+    Sheet1: 第1行为合并的标题行，第2行为表头 H0..Hn，数据每5行有一行留空，B列带数字格式，A列设置列宽
+    Sheet2: 前sheet2_headers行为表头，第j行与Sheet1表头错开j-1列且只有奇数列能匹配，之后为rows//2行数据
+    Sheet3: sheet3_rows行旧数据，处理时被替换
+    """
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Sheet1"
+    ws.append(["BOM"] + [None] * (cols - 1))
+    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=cols)
+    ws.append([f"H{c}" for c in range(cols)])
+    for r in range(rows):
+        ws.append([f"P{r}"] + [r * c / 7 if r % 5 else None for c in range(1, cols)])
+    for row in ws.iter_rows(min_row=3, min_col=2, max_col=2):
+        row[0].number_format = "0.00"
+    ws.column_dimensions["A"].width = 24
+
+    sheet2 = wb.create_sheet("Sheet2")
+    for j in range(sheet2_headers):
+        sheet2.append([f"H{c + j}" if c % 2 else f"X{c}" for c in range(cols)])
+    for r in range(rows // 2):
+        sheet2.append([f"Q{r}"] + [r + c for c in range(1, cols)])
+
+    sheet3 = wb.create_sheet("Sheet3")
+    for _ in range(sheet3_rows):
+        sheet3.append(["旧数据"] * cols)
+    wb.save(path)
+
+
+def make_lookup(path: str, keys: int, changed_key: str = None) -> None:
+    """smap 的查找表：旧品号 P00000.. -> 新品号 N00000..，changed_key 对应的新品号加上“-改”"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["旧品号", "新品号"])
+    for i in range(keys):
+        key = f"P{i:05d}"
+        ws.append([key, f"N{i:05d}" + ("-改" if key == changed_key else "")])
+    wb.save(path)
+
+
+def make_target(
+    path: str, rows: int, keys: int, edited: frozenset = frozenset(), seed: int = 0
+) -> None:
+    """
+    smap 的目标文件：第1行标题，第2行表头（主件、元件品号、用量）
+    元件品号约一半能在查找表中找到，edited 中的行改为 P00000
+    """
+    rng = random.Random(seed)
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("BOM")
+    ws.append(["BOM"])
+    ws.append(["主件", "元件品号", "用量"])
+    for r in range(rows):
+        key = f"P{rng.randrange(keys * 2):05d}"
+        ws.append([f"M{r}", "P00000" if r in edited else key, r % 7])
+    wb.save(path)
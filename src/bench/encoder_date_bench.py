@@ -0,0 +1,76 @@
+"""
+编码器函数1（日期格式化）单元格耗时对比
+
+在 src 目录下运行: python -m bench.encoder_date_bench
+"""
+
+import random
+import time
+from datetime import datetime
+
+from scripts.encoder import DateNormalizer, ValueCell
+
+
+def legacy_date_processor(cell, sheet) -> str:
+    """优化前的函数1实现，作为对照"""
+    value = cell.value
+    if isinstance(value, datetime):
+        return value.strftime("%y%m%d")
+    try:
+        if isinstance(value, str):
+            for fmt in ("%Y/%m/%d", "%Y-%m/%d", "%m/%d/%Y", "%m-%d-%Y"):
+                try:
+                    dt = datetime.strptime(value, fmt)
+                    return dt.strftime("%y%m%d")
+                except ValueError:
+                    continue
+        elif isinstance(value, (int, float)):
+            try:
+                dt = datetime.fromordinal(
+                    datetime(1900, 1, 1).toordinal() + int(value) - 2
+                )
+                return dt.strftime("%y%m%d")
+            except (ValueError, OverflowError):
+                pass
+    except Exception:
+        pass
+    return str(value)
+
+
+def make_column(rows: int = 100_000, distinct: int = 60):
+    """生成日期列：少量不同日期大量重复，混合字符串/序列号/datetime"""
+    random.seed(0)
+    pool = []
+    for i in range(distinct):
+        day = datetime(2025, 1 + i % 12, 1 + i % 28)
+        pool.append(day.strftime("%m/%d/%Y"))
+        pool.append(day.strftime("%m-%d-%Y"))
+        pool.append(45000 + i)
+        pool.append(day)
+    return [ValueCell(random.choice(pool), row, 2) for row in range(1, rows + 1)]
+
+
+def bench(func, cells) -> float:
+    start = time.perf_counter()
+    for cell in cells:
+        func(cell, None)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    cells = make_column()
+    normalizer = DateNormalizer()
+
+    assert [legacy_date_processor(c, None) for c in cells] == [
+        normalizer(c, None) for c in cells
+    ]
+
+    for name, func in (
+        ("legacy", legacy_date_processor),
+        ("DateNormalizer", DateNormalizer()),
+    ):
+        seconds = bench(func, cells)
+        print(
+            f"{name:<16} {len(cells)}行 {seconds:.4f}秒 "
+            f"{seconds / len(cells) * 1e6:.3f}微秒/单元格"
+        )
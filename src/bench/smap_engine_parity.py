@@ -0,0 +1,135 @@
+"""
+smap 查找引擎一致性与耗时对比
+
+生成一个查找表和一个目标文件（含数字、浮点、空值、未匹配等混合键），
+分别用 python 引擎和 pandas 引擎在 full/streaming 模式、empty/keep 策略下处理
+（含一个复合键、多列返回的映射），
+逐单元格比较输出并打印整体耗时和纯查找替换耗时；结果不一致时以非零状态退出。
+
+在 src 目录下运行: python -m bench.smap_engine_parity --rows 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List
+
+import openpyxl
+
+from bench._common import read_values, workdir
+from scripts.smap import Smap, EmptyOrKeep, smap
+
+
+def make_files(directory: str, rows: int, keys: int = 5000):
+    random.seed(0)
+    key_values = [f"P{i:05d}" for i in range(keys)] + list(range(100)) + [1.5, None]
+    lookup_path = os.path.join(directory, "lookup.xlsx")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["旧品号", "新品号", "名称", "规格", "组合品号", "组合名称", "主件", "用量"])
+    for key in key_values:
+        # 约10%的键对应空值，按未匹配处理
+        ws.append(
+            [key, f"N-{key}" if random.random() > 0.1 else None, key, f"S-{key}"]
+            + [key, key, f"C-{key}", random.choice([1, 2, None])]
+        )
+    wb.save(lookup_path)
+
+    candidates = key_values + ["missing", "P99999", 1.0, 2.0, None]
+    target_path = os.path.join(directory, "target.xlsx")
+    wb = openpyxl.Workbook()
+    for title in ("BOM1", "BOM2"):
+        ws = wb.create_sheet(title)
+        ws.append([title])
+        ws.append(["主件", "元件品号", "名称", "用量"])
+        for r in range(rows):
+            key = random.choice(candidates)
+            name = key if random.random() > 0.5 else random.choice(candidates)
+            ws.append([f"M{r}", key, name, r % 7])
+    del wb["Sheet"]
+    wb.save(target_path)
+    return lookup_path, target_path, len(key_values) + 1
+
+
+def make_config(last_row: int) -> dict:
+    return {
+        "组合": {
+            "match": ["元件品号", "名称"],
+            "write": ["主件", "用量"],
+            "source": f"E2:H{last_row}",
+        },
+        "元件品号": f"A2:B{last_row}",
+        "名称": f"C2:D{last_row}",
+    }
+
+
+def compare_engines(
+    target_path: str, lookup_path: str, config: dict, verbose: bool = False
+) -> List[str]:
+    """两个引擎在各模式、策略下处理，返回输出不一致的 “模式 策略”，全部一致时为空"""
+    mismatches = []
+    for mode in ("full", "streaming"):
+        for not_match in ("empty", "keep"):
+            outputs = {}
+            for engine in ("python", "pandas"):
+                start = time.perf_counter()
+                outputs[engine] = smap(
+                    target_path,
+                    lookup_path,
+                    config=config,
+                    suffix=f"_{mode}_{not_match}_{engine}",
+                    not_math=not_match,
+                    cache="bypass",
+                    mode=mode,
+                    engine=engine,
+                )
+                if verbose:
+                    print(f"{mode:<9} {not_match:<5} {engine:<6} {time.perf_counter() - start:.2f}秒")
+            if read_values(outputs["python"]) != read_values(outputs["pandas"]):
+                mismatches.append(f"{mode} {not_match}")
+    return mismatches
+
+
+def check(rows: int = 2000) -> List[str]:
+    with workdir() as tmp:
+        lookup_path, target_path, last_row = make_files(tmp, rows)
+        return compare_engines(target_path, lookup_path, make_config(last_row))
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--rows", type=int, default=20000, help="每个Sheet的行数")
+    args = p.parse_args()
+
+    with workdir() as tmp:
+        lookup_path, target_path, last_row = make_files(tmp, args.rows)
+        config = make_config(last_row)
+        mismatches = compare_engines(target_path, lookup_path, config, verbose=True)
+        for mismatch in mismatches:
+            print(f"{mismatch}: 两个引擎的输出不一致")
+
+        # 只比较查找替换本身（不含读写Excel）
+        values = read_values(target_path)["BOM1"]
+        column = [row[1] for row in values[2:]]
+        for engine in ("python", "pandas"):
+            processor = Smap(
+                target_path,
+                lookup_path,
+                header_row=2,
+                config=config,
+                match_handler=EmptyOrKeep("keep"),
+                cache="bypass",
+                engine=engine,
+            )
+            processor._load_lookup_data()
+            processor._map_values("元件品号", column[:10], [column[:10]])  # 预先建立索引
+            start = time.perf_counter()
+            processor._map_values("元件品号", column, [column])
+            milliseconds = (time.perf_counter() - start) * 1000
+            print(f"查找替换 {engine:<6} {len(column)}行 {milliseconds:.1f}毫秒")
+
+    if mismatches:
+        sys.exit(1)
+    print("两个引擎的输出一致")
@@ -0,0 +1,86 @@
+"""
+smap 增量处理耗时与一致性
+
+生成一个目标文件和一个查找表，依次测量：
+1. 普通流式处理
+2. 增量模式首次运行（生成行指纹清单）
+3. 目标文件和查找表都未变化时再次运行
+4. 只修改少量行后再次运行（沿用未修改的行）
+5. 再修改一个查找项后再次运行（只重新计算键对应该查找项的行）
+第4、5步都与普通流式处理的输出逐单元格比较，并比较字段匹配统计
+
+在 src 目录下运行: python -m bench.smap_incremental_bench --rows 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+from bench._common import make_lookup, make_target, read_values, workdir
+from scripts.smap import Smap
+
+
+def run(target_path: str, lookup_path: str, config: dict, suffix: str, incremental: bool):
+    processor = Smap(
+        target_path,
+        lookup_path,
+        header_row=2,
+        config=config,
+        suffix=suffix,
+        cache="bypass",
+        mode="streaming",
+        incremental=incremental,
+    )
+    start = time.perf_counter()
+    path = processor.process()
+    return path, time.perf_counter() - start, processor
+
+
+def check(target_path: str, lookup_path: str, config: dict, inc_path: str, inc) -> bool:
+    plain_path, _, plain = run(target_path, lookup_path, config, "_plain", False)
+    same_values = read_values(inc_path) == read_values(plain_path)
+    same_stats = inc.field_stats == plain.field_stats
+    print(f"  输出{'一致' if same_values else '不一致'} 匹配统计{'一致' if same_stats else '不一致'}")
+    return same_values and same_stats
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--rows", type=int, default=200000, help="目标文件行数")
+    p.add_argument("--keys", type=int, default=3000, help="查找表键数量")
+    p.add_argument("--edits", type=int, default=200, help="第二次运行前修改的行数")
+    args = p.parse_args()
+
+    with workdir() as tmp:
+        lookup_path = os.path.join(tmp, "lookup.xlsx")
+        target_path = os.path.join(tmp, "target.xlsx")
+        make_lookup(lookup_path, args.keys)
+        make_target(target_path, args.rows, args.keys)
+        config = {"元件品号": f"A2:B{args.keys + 1}"}
+
+        _, seconds, _ = run(target_path, lookup_path, config, "_plain", False)
+        print(f"普通流式处理       {seconds:.2f}秒")
+        inc_path, seconds, processor = run(target_path, lookup_path, config, "_inc", True)
+        print(f"增量首次运行       {seconds:.2f}秒 {dict(processor.incremental_stats)}")
+        print(f"  清单大小 {os.path.getsize(inc_path + '.manifest') / 1024 / 1024:.1f}MB")
+        _, seconds, processor = run(target_path, lookup_path, config, "_inc", True)
+        print(f"无变化再次运行     {seconds:.2f}秒 {dict(processor.incremental_stats)}")
+        ok = check(target_path, lookup_path, config, inc_path, processor)
+
+        edited = frozenset(random.Random(1).sample(range(args.rows), args.edits))
+        make_target(target_path, args.rows, args.keys, edited)
+        _, seconds, processor = run(target_path, lookup_path, config, "_inc", True)
+        print(f"修改少量行后运行   {seconds:.2f}秒 {dict(processor.incremental_stats)}")
+        ok = check(target_path, lookup_path, config, inc_path, processor) and ok
+
+        make_lookup(lookup_path, args.keys, changed_key="P00001")
+        _, seconds, processor = run(target_path, lookup_path, config, "_inc", True)
+        print(f"修改查找项后运行   {seconds:.2f}秒 {dict(processor.incremental_stats)}")
+        ok = check(target_path, lookup_path, config, inc_path, processor) and ok
+
+    if not ok:
+        print("增量处理与普通流式处理不一致")
+        sys.exit(1)
+    print("增量处理与普通流式处理一致")
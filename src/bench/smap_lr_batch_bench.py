@@ -0,0 +1,113 @@
+"""
+smap_lr 批量模式耗时对比
+
+生成若干个文件（每个文件一个Sheet1和一个有多行表头的Sheet2），每个文件执行多组 (row1, row2) 任务：
+逐个任务加载、处理、保存（原来逐次调用的方式）与 run_tool_copy_clomun_batch 对比，
+并检查两种方式每个任务的匹配数、不匹配数是否一致。
+
+在 src 目录下运行: python -m bench.smap_lr_batch_bench --files 8 --jobs 4 --rows 5000
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import time
+from typing import List
+
+from bench._common import make_smap_lr_file, workdir
+from scripts.smap_lr.core.handers import CopyCloumnHandler
+from scripts.smap_lr.core.processor import Processor
+from scripts.smap_lr.main import (
+    BatchFileConfig,
+    BatchResult,
+    CopyClomunJob,
+    run_tool_copy_clomun_batch,
+)
+
+
+def make_jobs(jobs: int, max_num: int) -> List[CopyClomunJob]:
+    """
+    正向任务：row2为处理结果Sheet的表头行（Sheet1的第2行），row1为Sheet2的表头行；
+    每组任务匹配Sheet2的不同表头行（与Sheet1表头错开的列数不同，匹配数不同）
+    """
+    return [CopyClomunJob(row1=j + 1, row2=2, max_num=max_num) for j in range(jobs)]
+
+
+def copies(template: str, directory: str, prefix: str, files: int) -> List[str]:
+    paths = []
+    for f in range(files):
+        path = os.path.join(directory, f"{prefix}_{f:02d}.xlsx")
+        shutil.copy(template, path)
+        paths.append(path)
+    return paths
+
+
+def run_one_by_one(paths: list, jobs: list) -> list:
+    """每个任务单独加载、处理、保存"""
+    counts = []
+    for path in paths:
+        for job in jobs:
+            p = Processor(path)
+            h = CopyCloumnHandler(job.max_num)
+            p.process(
+                direction=job.direction,
+                row1=job.row1,
+                row2=job.row2,
+                on_match=h.my_on_match,
+                on_nomatch=h.my_on_nomatch,
+            )
+            p.save()
+            counts.append((len(h.matches), len(h.not_matches)))
+    return counts
+
+
+def same_counts(single_counts: list, result: BatchResult) -> bool:
+    """批量模式没有出错，且每个任务的匹配数、不匹配数与逐个任务处理一致"""
+    batch_counts = [(job.matches, job.not_matches) for file in result.files for job in file.jobs]
+    return not any(file.error for file in result.files) and batch_counts == single_counts
+
+
+def check(files: int = 2, jobs: int = 3, rows: int = 500, cols: int = 12) -> bool:
+    job_list = make_jobs(jobs, 200)
+    with workdir() as tmp:
+        template = os.path.join(tmp, "template.xlsx")
+        make_smap_lr_file(template, rows, cols, sheet2_headers=jobs)
+        single_counts = run_one_by_one(copies(template, tmp, "single", files), job_list)
+        paths = copies(template, tmp, "batch", files)
+        configs = [BatchFileConfig(fp=path, jobs=job_list) for path in paths]
+        result = run_tool_copy_clomun_batch(configs)
+        return same_counts(single_counts, result)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--files", type=int, default=8, help="文件数量")
+    p.add_argument("--jobs", type=int, default=4, help="每个文件的任务数量")
+    p.add_argument("--rows", type=int, default=5000, help="每个Sheet1的数据行数")
+    p.add_argument("--cols", type=int, default=12, help="列数")
+    p.add_argument("--max-num", type=int, default=200, help="每次匹配最多复制的行数")
+    args = p.parse_args()
+
+    jobs = make_jobs(args.jobs, args.max_num)
+    with workdir() as tmp:
+        template = os.path.join(tmp, "template.xlsx")
+        make_smap_lr_file(template, args.rows, args.cols, sheet2_headers=args.jobs)
+
+        paths = copies(template, tmp, "single", args.files)
+        start = time.perf_counter()
+        single_counts = run_one_by_one(paths, jobs)
+        single_seconds = time.perf_counter() - start
+
+        paths = copies(template, tmp, "batch", args.files)
+        result = run_tool_copy_clomun_batch([BatchFileConfig(fp=path, jobs=jobs) for path in paths])
+
+    print(result.summary())
+    print(
+        f"{args.files}个文件 每个{args.jobs}组任务 "
+        f"逐个任务 {single_seconds:.2f}秒 批量 {result.wall_seconds:.2f}秒"
+    )
+    if not same_counts(single_counts, result):
+        print("两种方式的匹配统计不一致")
+        sys.exit(1)
+    print("两种方式的匹配统计一致")
@@ -0,0 +1,98 @@
+"""
+smap_lr 结果表克隆耗时对比
+
+生成一个Sheet1（默认10万行，含合并单元格、数字格式和列宽）、一个Sheet2和一个已有内容的Sheet3，
+对比原来的清空Sheet3后逐行追加值的复制方式与 Processor._clone_sheet，
+并检查两种方式的值是否一致、克隆结果是否保留了样式和合并单元格。
+
+在 src 目录下运行: python -m bench.smap_lr_clone_bench --rows 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Tuple
+
+import openpyxl
+from openpyxl.worksheet.worksheet import Worksheet
+
+from bench._common import make_smap_lr_file, workdir
+from scripts.smap_lr.core.processor import Processor
+
+
+def legacy_copy(source_sheet: Worksheet, target_sheet: Worksheet) -> None:
+    """原来的复制方式：清空目标表，逐行追加值，再复制列宽"""
+    if target_sheet.dimensions:
+        target_sheet.delete_rows(1, target_sheet.max_row)
+        target_sheet.delete_cols(1, target_sheet.max_column)
+    for row in source_sheet.iter_rows():
+        target_sheet.append([cell.value for cell in row])
+    for col_letter, col_dim in source_sheet.column_dimensions.items():
+        if col_dim.width is not None:
+            target_sheet.column_dimensions[col_letter].width = col_dim.width
+
+
+def values(sheet: Worksheet) -> list:
+    return list(sheet.iter_rows(values_only=True))
+
+
+def run_legacy(path: str) -> Tuple[float, list]:
+    """原复制方式，只计复制本身，不含加载工作簿；返回 (耗时, 复制得到的值)"""
+    wb = openpyxl.load_workbook(path)
+    start = time.perf_counter()
+    legacy_copy(wb["Sheet1"], wb["Sheet3"])
+    return time.perf_counter() - start, values(wb["Sheet3"])
+
+
+def run_clone(path: str) -> Tuple[float, Processor, Worksheet]:
+    """Processor._clone_sheet，返回 (耗时, 处理器, 克隆得到的Sheet3)"""
+    processor = Processor.__new__(Processor)
+    processor.wb = openpyxl.load_workbook(path)
+    start = time.perf_counter()
+    sheet3 = processor._clone_sheet(processor.wb["Sheet1"], "Sheet3")
+    return time.perf_counter() - start, processor, sheet3
+
+
+def same_clone(processor: Processor, sheet3: Worksheet, legacy_values: list) -> bool:
+    """克隆结果的值与原复制方式一致，并保留了Sheet位置、合并单元格、数字格式和列宽"""
+    return (
+        values(sheet3) == legacy_values
+        and processor.wb.sheetnames == ["Sheet1", "Sheet2", "Sheet3"]
+        and str(sheet3.merged_cells) == str(processor.wb["Sheet1"].merged_cells)
+        and sheet3["B3"].number_format == "0.00"
+        and sheet3.column_dimensions["A"].width == 24
+    )
+
+
+def check(rows: int = 2000, cols: int = 8) -> bool:
+    with workdir() as tmp:
+        path = os.path.join(tmp, "clone.xlsx")
+        make_smap_lr_file(path, rows, cols, sheet3_rows=100)
+        _, legacy_values = run_legacy(path)
+        _, processor, sheet3 = run_clone(path)
+        return same_clone(processor, sheet3, legacy_values)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--rows", type=int, default=100000, help="Sheet1的数据行数")
+    p.add_argument("--cols", type=int, default=8, help="列数")
+    args = p.parse_args()
+
+    with workdir() as tmp:
+        path = os.path.join(tmp, "clone.xlsx")
+        make_smap_lr_file(path, args.rows, args.cols, sheet3_rows=1000)
+        legacy_seconds, legacy_values = run_legacy(path)
+        clone_seconds, processor, sheet3 = run_clone(path)
+
+        print(f"{args.rows}行 原复制方式 {legacy_seconds:.2f}秒 克隆 {clone_seconds:.2f}秒")
+        print(f"克隆结果: Sheet顺序 {processor.wb.sheetnames} 合并单元格 {sheet3.merged_cells.ranges}")
+        width = sheet3.column_dimensions["A"].width
+        print(f"克隆结果: B3数字格式 {sheet3['B3'].number_format} A列宽 {width}")
+        ok = same_clone(processor, sheet3, legacy_values)
+
+    if not ok:
+        print("两种方式复制的结果不一致")
+        sys.exit(1)
+    print("两种方式复制的结果一致")
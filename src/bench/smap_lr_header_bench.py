@@ -0,0 +1,111 @@
+"""
+smap_lr 表头匹配耗时对比
+
+生成Sheet1、Sheet2各一行宽表头（默认5000列，约一半能匹配，含重复值），
+对比原来逐个 list.index 的匹配方式与 Processor 的哈希索引匹配，
+两个方向都检查匹配结果是否一致；不一致时以非零状态退出。
+
+在 src 目录下运行: python -m bench.smap_lr_header_bench --cols 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import openpyxl
+
+from bench._common import workdir
+from scripts.smap_lr.core.processor import Processor
+
+
+def make_file(path: str, cols: int):
+    random.seed(0)
+    headers1 = [f"H{random.randrange(cols * 2)}" for _ in range(cols)]
+    headers2 = [f"H{random.randrange(cols * 2)}" for _ in range(cols)]
+    wb = openpyxl.Workbook()
+    wb.active.title = "Sheet1"
+    wb["Sheet1"].append(headers1)
+    wb.create_sheet("Sheet2").append(headers2)
+    wb.save(path)
+
+
+def list_index_match(outer_cells, inner_cells) -> list:
+    """原来的匹配方式：每个单元格在另一行中 list.index，未匹配时抛出异常"""
+    inner_values = [cell.value for cell in inner_cells]
+    result = []
+    for cell in outer_cells:
+        try:
+            result.append((cell, inner_cells[inner_values.index(cell.value)]))
+        except ValueError:
+            result.append((cell, None))
+    return result
+
+
+def hash_match(processor: Processor, direction: bool) -> list:
+    result = []
+    on_match = lambda c1, c2, s1, s2: result.append((c1, c2) if direction else (c2, c1))
+    on_nomatch = lambda c, s1, s2: result.append((c, None))
+    if direction:
+        processor.left_to_right(1, 1, on_match, on_nomatch)
+    else:
+        processor.right_to_left(1, 1, on_match, on_nomatch)
+    return result
+
+
+def compare(processor: Processor, direction: bool):
+    """
+    按一个方向用两种方式匹配Sheet3和Sheet2的第1行
+    :return: (list.index耗时, 哈希索引耗时, 匹配结果是否一致, 匹配到的列数)
+    """
+    sheet2_cells = processor._row_cells(processor.sheet2, 1, "Sheet2")
+    sheet3_cells = processor._row_cells(processor.sheet3, 1, "Sheet3")
+    outer, inner = (sheet3_cells, sheet2_cells) if direction else (sheet2_cells, sheet3_cells)
+
+    start = time.perf_counter()
+    expected = list_index_match(outer, inner)
+    old_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = hash_match(processor, direction)
+    new_seconds = time.perf_counter() - start
+
+    matched = sum(1 for _, cell in actual if cell is not None)
+    return old_seconds, new_seconds, expected == actual, matched
+
+
+def check(cols: int = 500) -> bool:
+    with workdir() as tmp:
+        path = os.path.join(tmp, "headers.xlsx")
+        make_file(path, cols)
+        processor = Processor(path)
+        return all(compare(processor, direction)[2] for direction in (True, False))
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--cols", type=int, default=5000, help="表头列数")
+    args = p.parse_args()
+
+    with workdir() as tmp:
+        path = os.path.join(tmp, "headers.xlsx")
+        make_file(path, args.cols)
+        processor = Processor(path)
+
+    mismatches = 0
+    for direction in (True, False):
+        old_seconds, new_seconds, same, matched = compare(processor, direction)
+        name = "left_to_right" if direction else "right_to_left"
+        print(
+            f"{name} {args.cols}x{args.cols} 匹配{matched}列 "
+            f"list.index {old_seconds * 1000:.1f}毫秒 哈希索引 {new_seconds * 1000:.1f}毫秒 "
+            f"加速比 {old_seconds / new_seconds:.1f}x"
+        )
+        if not same:
+            mismatches += 1
+            print(f"{name}: 匹配结果不一致")
+
+    if mismatches:
+        sys.exit(1)
+    print("两种匹配方式结果一致")
@@ -0,0 +1,101 @@
+"""
+smap_lr 叠加模式与克隆模式对比
+
+生成一个Sheet1（默认10万行，含合并单元格、数字格式和列宽）和一个Sheet2，
+分别用克隆模式和叠加模式（Processor(overlay=True)）按两个方向处理并保存，
+输出耗时和内存峰值，并逐个比较两个输出文件中除 docProps 外的所有部件是否字节一致。
+
+在 src 目录下运行: python -m bench.smap_lr_overlay_bench --rows 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from typing import List
+
+from bench._common import different_parts, make_smap_lr_file, workdir
+from scripts.smap_lr.core.handers import CopyCloumnHandler
+from scripts.smap_lr.core.processor import Processor
+
+
+def run(path: str, output_path: str, overlay: bool, direction: bool, max_num: int):
+    processor = Processor(path, overlay=overlay)
+    handler = CopyCloumnHandler(max_num)
+    # Sheet3（Sheet1）的表头在第2行，Sheet2的表头在第1行；
+    # Processor.process 中 row1、row2 对应的Sheet随方向而变
+    processor.process(
+        direction=direction,
+        row1=1 if direction else 2,
+        row2=2 if direction else 1,
+        on_match=handler.my_on_match,
+        on_nomatch=handler.my_on_nomatch,
+    )
+    processor.save(output_path)
+    return handler
+
+
+def compare(clone_path: str, clone, overlay_path: str, overlay) -> List[str]:
+    """两种模式的输出中不同的部件名，匹配结果不同时加上“匹配结果”，一致时为空"""
+    different = different_parts(clone_path, overlay_path)
+    if (clone.matches, clone.not_matches) != (overlay.matches, overlay.not_matches):
+        different.append("匹配结果")
+    return different
+
+
+def check(rows: int = 2000, cols: int = 8, max_num: int = 100000) -> List[str]:
+    """按两个方向比较两种模式，返回不一致的项，一致时为空"""
+    different = []
+    with workdir() as tmp:
+        path = os.path.join(tmp, "overlay.xlsx")
+        make_smap_lr_file(path, rows, cols)
+        for direction in (True, False):
+            outputs = []
+            for overlay in (False, True):
+                output_path = os.path.join(tmp, f"out_{direction}_{overlay}.xlsx")
+                outputs += [output_path, run(path, output_path, overlay, direction, max_num)]
+            different += [f"{direction}: {name}" for name in compare(*outputs)]
+    return different
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--rows", type=int, default=100000, help="Sheet1的数据行数")
+    p.add_argument("--cols", type=int, default=8, help="列数")
+    p.add_argument("--max-num", type=int, default=100000, help="每次匹配最多复制的行数")
+    args = p.parse_args()
+
+    failed = False
+    with workdir() as tmp:
+        path = os.path.join(tmp, "overlay.xlsx")
+        make_smap_lr_file(path, args.rows, args.cols)
+
+        for direction in (True, False):
+            outputs = []
+            for overlay in (False, True):
+                output_path = os.path.join(tmp, f"out_{direction}_{overlay}.xlsx")
+                start = time.perf_counter()
+                handler = run(path, output_path, overlay, direction, args.max_num)
+                seconds = time.perf_counter() - start
+                # tracemalloc会明显拖慢处理速度，内存峰值单独再跑一次测量
+                tracemalloc.start()
+                run(path, output_path, overlay, direction, args.max_num)
+                peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+                tracemalloc.stop()
+                outputs += [output_path, handler]
+                mode = "叠加" if overlay else "克隆"
+                print(
+                    f"方向{'左到右' if direction else '右到左'} {mode}模式 "
+                    f"{seconds:.2f}秒 内存峰值{peak:.1f}MB 匹配{len(handler.matches)}列"
+                )
+
+            different = compare(*outputs)
+            if different:
+                print(f"两种模式的输出不一致: {different}")
+                failed = True
+            else:
+                print("两种模式的输出字节一致")
+
+    if failed:
+        sys.exit(1)
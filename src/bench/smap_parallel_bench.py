@@ -0,0 +1,53 @@
+"""
+smap 多文件并行处理加速比
+
+生成20个目标文件和一个查找表，分别用1、2、4…个进程处理并输出耗时与加速比。
+
+在 src 目录下运行: python -m bench.smap_parallel_bench --files 20 --rows 20000
+"""
+
+import argparse
+import os
+import time
+
+from bench._common import make_lookup, make_target, workdir
+from scripts.smap import smap_parallel
+
+
+def make_files(directory: str, files: int, rows: int, keys: int = 3000):
+    lookup_path = os.path.join(directory, "lookup.xlsx")
+    make_lookup(lookup_path, keys)
+    target_paths = []
+    for f in range(files):
+        path = os.path.join(directory, f"target_{f:02d}.xlsx")
+        make_target(path, rows, keys, seed=f)
+        target_paths.append(path)
+    return lookup_path, target_paths
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--files", type=int, default=20, help="目标文件数量")
+    p.add_argument("--rows", type=int, default=20000, help="每个目标文件的行数")
+    p.add_argument("--keys", type=int, default=3000, help="查找表键数量")
+    args = p.parse_args()
+
+    with workdir() as tmp:
+        lookup_path, target_paths = make_files(tmp, args.files, args.rows, args.keys)
+        config = {"元件品号": f"A2:B{args.keys + 1}"}
+
+        workers = 1
+        baseline = None
+        while workers <= (os.cpu_count() or 1):
+            start = time.perf_counter()
+            smap_parallel(
+                target_paths,
+                lookup_path,
+                config=config,
+                cache="bypass",
+                max_workers=workers,
+            )
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            print(f"{workers:>2}个进程 {seconds:.2f}秒 加速比 {baseline / seconds:.2f}x")
+            workers *= 2
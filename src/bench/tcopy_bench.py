@@ -0,0 +1,142 @@
+"""
+tcopy 大文件模板复制耗时
+
+生成一个大的BOM导出文件（默认50万行，write_only模式写入、共享字符串表较大），
+用 tcopy 复制出只保留表头的模板，输出文件大小、耗时，
+并用 openpyxl 检查模板的表头值、列宽与原文件一致且不含数据行。
+另外生成一个带表格和批注的小文件，检查表格区域截到表头范围内、标题行被去掉的表格和表头之后的批注被去掉。
+
+在 src 目录下运行: python -m bench.tcopy_bench --rows 500000 --header-rows 2
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.comments import Comment
+from openpyxl.styles import Font
+from openpyxl.worksheet.table import Table
+
+from bench._common import workdir
+from scripts.tcopy import tcopy
+
+
+def make_file(path: str, rows: int, cols: int):
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("BOM")
+    ws.column_dimensions["B"].width = 30
+    header = []
+    for c in range(cols):
+        cell = WriteOnlyCell(ws, value=f"字段{c}")
+        cell.font = Font(bold=True)
+        header.append(cell)
+    ws.append(header)
+    ws.append([f"field_{c}" for c in range(cols)])
+    for r in range(rows):
+        ws.append([f"M{r % 5000}", f"P{r}"] + [r * c for c in range(2, cols)])
+    wb.create_sheet("说明").append(["说明"])
+    wb.save(path)
+
+
+def make_table_file(path: str):
+    """表格T1的标题行在第2行，T2的标题行在第40行；A1和A30各有一条批注"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "BOM"
+    ws.append(["BOM"])
+    ws.append(["主件", "元件", "用量"])
+    for r in range(50):
+        ws.append([f"M{r}", f"P{r}", r])
+    for c, name in enumerate(["品号", "品名"], 5):
+        ws.cell(row=40, column=c, value=name)
+        ws.cell(row=41, column=c, value=f"{name}1")
+    ws.add_table(Table(displayName="T1", ref="A2:C52"))
+    ws.add_table(Table(displayName="T2", ref="E40:F41"))
+    ws["A1"].comment = Comment("表头批注", "bench")
+    ws["A30"].comment = Comment("数据批注", "bench")
+    wb.save(path)
+
+
+def check_tables(path: str) -> bool:
+    """检查不同表头行数下模板中的表格和批注"""
+    ok = True
+    for header_rows, tables, comments in ((0, {}, []), (2, {"T1": "A2:C3"}, ["A1"])):
+        output = tcopy(path, suffix=f"_template{header_rows}", header_rows=header_rows)
+        ws = openpyxl.load_workbook(output)["BOM"]
+        actual_tables = dict(ws.tables.items())
+        actual_comments = [cell.coordinate for row in ws.iter_rows() for cell in row if cell.comment]
+        print(
+            f"表头{header_rows}行 模板行数 {ws.max_row} 表格 {actual_tables} 批注 {actual_comments}"
+        )
+        ok = (
+            ok
+            and ws.max_row == max(header_rows, 1)
+            and actual_tables == tables
+            and actual_comments == comments
+        )
+    return ok
+
+
+def header_values(path: str, sheet: str, rows: int) -> list:
+    wb = openpyxl.load_workbook(path, read_only=True)
+    values = list(wb[sheet].iter_rows(max_row=rows, values_only=True))
+    wb.close()
+    return values
+
+
+def same_header(path: str, output: str, header_rows: int) -> bool:
+    """模板BOM表的值与原文件前header_rows行一致，保留了B列宽和A1的粗体"""
+    template = openpyxl.load_workbook(output)
+    ws = template["BOM"]
+    actual = [tuple(row) for row in ws.iter_rows(values_only=True)]
+    width = ws.column_dimensions["B"].width
+    print(f"模板 Sheet {template.sheetnames} 行数 {ws.max_row} B列宽 {width}")
+    return (
+        actual == header_values(path, "BOM", header_rows)
+        and width == 30
+        and ws["A1"].font.b
+    )
+
+
+def check(rows: int = 2000, cols: int = 12, header_rows: int = 2) -> bool:
+    with workdir() as tmp:
+        path = os.path.join(tmp, "bom.xlsx")
+        make_file(path, rows, cols)
+        output = tcopy(path, suffix="_template", header_rows=header_rows)
+        table_path = os.path.join(tmp, "table.xlsx")
+        make_table_file(table_path)
+        return same_header(path, output, header_rows) and check_tables(table_path)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--rows", type=int, default=500000, help="数据行数")
+    p.add_argument("--cols", type=int, default=12, help="列数")
+    p.add_argument("--header-rows", type=int, default=2, help="保留的表头行数")
+    args = p.parse_args()
+
+    with workdir() as tmp:
+        path = os.path.join(tmp, "bom.xlsx")
+        make_file(path, args.rows, args.cols)
+
+        start = time.perf_counter()
+        output = tcopy(path, suffix="_template", header_rows=args.header_rows)
+        seconds = time.perf_counter() - start
+        print(
+            f"{os.path.getsize(path) / 1024 / 1024:.1f}MB -> "
+            f"{os.path.getsize(output) / 1024:.1f}KB tcopy {seconds:.2f}秒"
+        )
+        if not same_header(path, output, args.header_rows):
+            print("模板与原文件的表头不一致")
+            sys.exit(1)
+        print("模板与原文件的表头一致")
+
+        table_path = os.path.join(tmp, "table.xlsx")
+        make_table_file(table_path)
+        if not check_tables(table_path):
+            print("模板中的表格或批注不正确")
+            sys.exit(1)
+        print("模板中的表格和批注正确")
@@ -67,7 +67,7 @@ class TabPanel:
                 ui.input(label="函数索引", placeholder="例如: 0,1,2").classes(
                     "w-full"
                 ).bind_value_to(config, "function_indices").tooltip(
-                    "0不变;1格式日期为无分隔符"
+                    "0不变;1格式日期为无分隔符;2补零;3截取;4转大写;5查字典（2、3、5的参数在配置的function_params中设置）"
                 ).value = ",".join(map(str, config.function_indices))
 
                 ui.input(label="分隔符", placeholder="例如: -,-,-").classes(
@@ -84,6 +84,16 @@ class TabPanel:
                     config, "database_path"
                 ).value = config.database_path
 
+                ui.input(
+                    label="输出文件路径", placeholder="可选，.txt/.csv/.xlsx"
+                ).classes("w-full").props("clearable").bind_value_to(
+                    config, "output_path"
+                ).tooltip(
+                    "设置后结果直接写入文件，大批量时不在页面显示全部单号；"
+                    ".xlsx 为源工作簿另存并在新列写入单号，只保留单元格值，"
+                    "所有工作表的样式、合并单元格、列宽等格式都会丢失"
+                )
+
                 nz = ui.number(
                     label="补位数", placeholder="3表示补到三位如001", min=1
                 ).classes("w-full")
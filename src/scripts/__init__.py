@@ -1,14 +1,31 @@
-from .encoder import run_tool as run_tool_encoder, ToolConfig as ToolConfigEncoder
-from .json5t import run_tool as run_tool_json5t, ToolConfig as ToolConfigJson5t
-from .visio2 import (
-    run_tool as run_tool_visio2,
-    ToolConfig as ToolConfigVisio2,
-    SUPPORT_FORMAT as SUPPORT_FORMAT_VISIO2,
-)
+from importlib import import_module
+
+# 按需导入：visio2 依赖 pythoncom/win32com，只在用到时才加载，
+# 直接导入 scripts.smap、scripts.tcopy 等子模块时不受影响
+_EXPORTS = {
+    "run_tool_encoder": (".encoder", "run_tool"),
+    "run_batch_encoder": (".encoder", "run_batch"),
+    "ToolConfigEncoder": (".encoder", "ToolConfig"),
+    "run_tool_json5t": (".json5t", "run_tool"),
+    "ToolConfigJson5t": (".json5t", "ToolConfig"),
+    "run_tool_visio2": (".visio2", "run_tool"),
+    "ToolConfigVisio2": (".visio2", "ToolConfig"),
+    "SUPPORT_FORMAT_VISIO2": (".visio2", "SUPPORT_FORMAT"),
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _EXPORTS[name]
+    value = getattr(import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
 
 
 __all__ = [
     "run_tool_encoder",
+    "run_batch_encoder",
     "ToolConfigEncoder",
     "run_tool_json5t",
     "ToolConfigJson5t",
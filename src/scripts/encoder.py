@@ -1,22 +1,77 @@
+import csv
 import sqlite3
 import os
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from openpyxl import load_workbook
+from functools import lru_cache
+from itertools import islice, repeat
+from openpyxl import Workbook, load_workbook
 from openpyxl.cell import Cell
 from openpyxl.worksheet.worksheet import Worksheet
-from typing import List, Tuple, Callable, Optional
+from typing import List, Tuple, Callable, Optional, Iterable, Iterator, Any, Dict
 from pydantic import BaseModel, field_validator, Field
 from pydantic_core.core_schema import FieldValidationInfo
 
 
+# 列函数: 接收整列原始值，返回等长的字符串列表
+ColumnFunction = Callable[[List[Any]], List[str]]
+
+
+class SerialConflictError(ValueError):
+    """指定流水号与已有记录冲突
+
+    conflicts 为 [(code, 冲突的流水号列表, 当前最大流水号), ...]
+    """
+
+    def __init__(self, conflicts: List[Tuple[str, List[int], int]]):
+        self.conflicts = conflicts
+        lines = [
+            f"编码 '{code}' 的流水号 {', '.join(map(str, serials))} 已存在，当前最大流水号为 {max_serial}"
+            for code, serials, max_serial in conflicts
+        ]
+        super().__init__("\n".join(lines))
+
+
 class DatabaseManager:
-    """数据库管理"""
+    """数据库管理
+
+    concurrent=True 时启用多进程并发模式：WAL 日志、BEGIN IMMEDIATE 分配流水号，
+    数据库忙时按退避间隔重试整个事务。
+    """
+
+    _shared: Dict[Tuple[str, bool], "DatabaseManager"] = {}
+    _shared_lock = threading.Lock()
 
-    def __init__(self, db_path: str = "excel_processor.db"):
+    def __init__(
+        self,
+        db_path: str = "excel_processor.db",
+        concurrent: bool = False,
+        busy_retries: int = 8,
+        busy_delay: float = 0.05,
+    ):
         self.db_path = db_path
+        self.concurrent = concurrent
+        self.busy_retries = busy_retries
+        self.busy_delay = busy_delay
         self.conn = None
+        self._lock = threading.RLock()
         self._ensure_database()
 
+    @classmethod
+    def shared(cls, db_path: str, concurrent: bool = False) -> "DatabaseManager":
+        """获取进程内共享的数据库连接，多次调用 run_tool 时复用"""
+        key = (os.path.abspath(db_path), concurrent)
+        with cls._shared_lock:
+            manager = cls._shared.get(key)
+            if manager is None or manager.conn is None:
+                manager = cls(db_path, concurrent=concurrent)
+                cls._shared[key] = manager
+            return manager
+
     def _ensure_database(self):
         """确保数据库文件存在"""
         # 检查目录是否存在，不存在则创建
@@ -24,8 +79,27 @@ class DatabaseManager:
         os.makedirs(db_dir, exist_ok=True)
 
         # 连接数据库（如果文件不存在会自动创建）
-        self.conn = sqlite3.connect(self.db_path)
-        self._create_table_if_not_exists()
+        # 共享连接可能被不同线程使用，由 self._lock 串行化
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        if self.concurrent:
+            self._run_with_retry(self.conn.execute, "PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._run_with_retry(self._in_transaction, self._create_table_if_not_exists)
+
+    def _run_with_retry(self, func: Callable, *args):
+        """数据库忙（locked/busy）时按指数退避重试，超过次数后抛出原异常"""
+        delay = self.busy_delay
+        for attempt in range(self.busy_retries + 1):
+            try:
+                return func(*args)
+            except sqlite3.OperationalError as e:
+                message = str(e)
+                if attempt == self.busy_retries or (
+                    "locked" not in message and "busy" not in message
+                ):
+                    raise
+                time.sleep(delay * (1 + random.random()))
+                delay = min(delay * 2, 1.0)
 
     def _create_table_if_not_exists(self):
         """确保表存在"""
@@ -47,11 +121,49 @@ class DatabaseManager:
                 UNIQUE (code, serial)
             )
             """)
-            self.conn.commit()
+
+        self._create_counter_table_if_not_exists()
+
+    def _create_counter_table_if_not_exists(self):
+        """确保流水号计数表存在，首次创建时从历史记录迁移"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+        SELECT count(name) FROM sqlite_master 
+        WHERE type='table' AND name='serial_counters'
+        """)
+
+        if cursor.fetchone()[0] == 0:
+            # 每个编码一行，记录已分配的最大流水号
+            self.conn.execute("""
+            CREATE TABLE serial_counters (
+                code TEXT PRIMARY KEY,
+                last_serial INTEGER NOT NULL
+            )
+            """)
+            # 迁移历史记录，保证与 MAX(serial) 的结果一致
+            self.conn.execute("""
+            INSERT INTO serial_counters (code, last_serial)
+            SELECT code, MAX(serial) FROM processed_records GROUP BY code
+            """)
+            # 手工删除记录后回落到剩余记录的最大流水号，与原先的 MAX(serial) 行为保持一致
+            self.conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS serial_counters_after_delete
+            AFTER DELETE ON processed_records
+            BEGIN
+                UPDATE serial_counters
+                SET last_serial = COALESCE(
+                    (SELECT MAX(serial) FROM processed_records WHERE code = OLD.code), 0
+                )
+                WHERE code = OLD.code;
+            END
+            """)
 
     def begin_transaction(self):
-        """开始事务"""
-        self.conn.execute("BEGIN TRANSACTION")
+        """开始事务，并发模式下立即获取写锁，避免读后升级写锁时死锁"""
+        if self.concurrent:
+            self.conn.execute("BEGIN IMMEDIATE")
+        else:
+            self.conn.execute("BEGIN TRANSACTION")
 
     def commit_transaction(self):
         """提交事务"""
@@ -69,6 +181,161 @@ class DatabaseManager:
         )
         return cursor.fetchone()[0]
 
+    def reserve_blocks(self, counts: Dict[str, int]) -> Dict[str, int]:
+        """为每个编码预留指定数量的连续流水号（需在事务中调用）
+
+        Returns:
+            各编码预留区间的起始流水号
+        """
+        self.conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS serial_requests "
+            "(code TEXT PRIMARY KEY, amount INTEGER NOT NULL)"
+        )
+        self.conn.execute("DELETE FROM temp.serial_requests")
+        self.conn.executemany(
+            "INSERT INTO temp.serial_requests (code, amount) VALUES (?, ?)",
+            counts.items(),
+        )
+
+        # 一条语句为所有编码预留区间
+        self.conn.execute("""
+        INSERT INTO serial_counters (code, last_serial)
+        SELECT code, amount FROM temp.serial_requests WHERE true
+        ON CONFLICT(code) DO UPDATE SET last_serial = last_serial + excluded.last_serial
+        """)
+        cursor = self.conn.execute("""
+        SELECT r.code, c.last_serial - r.amount + 1
+        FROM temp.serial_requests r JOIN serial_counters c ON c.code = r.code
+        """)
+        return dict(cursor.fetchall())
+
+    def reserve_serials(self, codes: List[str]) -> List[Tuple[str, int]]:
+        """按编码分组预留连续流水号（需在事务中调用）
+
+        每个不同编码只占用一次计数表更新，返回值与输入编码顺序一一对应，
+        与逐条 MAX(serial)+1 的分配结果相同。
+        """
+        next_serials = self.reserve_blocks(Counter(codes))
+
+        results = []
+        for code in codes:
+            serial = next_serials[code]
+            next_serials[code] = serial + 1
+            results.append((code, serial))
+        return results
+
+    def lease_blocks(self, counts: Dict[str, int]) -> Dict[str, int]:
+        """独立事务中预留流水号区间，供分配服务按块租用"""
+        with self._lock:
+            return self._run_with_retry(self._in_transaction, self.reserve_blocks, counts)
+
+    def release_block(self, code: str, first_serial: int, last_serial: int) -> bool:
+        """归还租用区间中未使用的部分 [first_serial, last_serial]
+
+        仅当计数表仍停在该区间末尾时才能退回，否则记录到 serial_gaps 表。
+
+        Returns:
+            是否成功退回
+        """
+
+        def release() -> bool:
+            cursor = self.conn.execute(
+                "UPDATE serial_counters SET last_serial = ? "
+                "WHERE code = ? AND last_serial = ?",
+                (first_serial - 1, code, last_serial),
+            )
+            if cursor.rowcount:
+                return True
+            self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS serial_gaps (
+                code TEXT NOT NULL,
+                first_serial INTEGER NOT NULL,
+                last_serial INTEGER NOT NULL,
+                create_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """)
+            self.conn.execute(
+                "INSERT INTO serial_gaps (code, first_serial, last_serial) VALUES (?, ?, ?)",
+                (code, first_serial, last_serial),
+            )
+            return False
+
+        with self._lock:
+            return self._run_with_retry(self._in_transaction, release)
+
+    def insert_allocated_records(self, records: List[Tuple[str, int]]) -> None:
+        """写入已预留流水号的记录"""
+
+        def insert():
+            self.conn.executemany(
+                "INSERT INTO processed_records (code, serial) VALUES (?, ?)",
+                records,
+            )
+
+        with self._lock:
+            self._run_with_retry(self._in_transaction, insert)
+
+    def _in_transaction(self, func: Callable, *args):
+        """在事务中执行 func，异常时回滚"""
+        try:
+            self.begin_transaction()
+            result = func(*args)
+            self.commit_transaction()
+            return result
+        except Exception as e:
+            self.rollback_transaction()
+            raise e
+
+    def find_conflicts(
+        self, records: List[Tuple[str, int]]
+    ) -> List[Tuple[str, List[int], int]]:
+        """批量检查 (code, serial) 是否已存在（需在事务中调用）
+
+        Returns:
+            冲突列表 [(code, 冲突的流水号列表, 当前最大流水号), ...]，按编码首次出现的顺序排列
+        """
+        self.conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS serial_candidates "
+            "(code TEXT NOT NULL, serial INTEGER NOT NULL)"
+        )
+        self.conn.execute("DELETE FROM temp.serial_candidates")
+        self.conn.executemany(
+            "INSERT INTO temp.serial_candidates (code, serial) VALUES (?, ?)",
+            records,
+        )
+
+        # 一次连接查出所有冲突及对应编码的当前最大流水号
+        cursor = self.conn.execute("""
+        SELECT c.code, c.serial,
+            (SELECT MAX(serial) FROM processed_records WHERE code = c.code)
+        FROM temp.serial_candidates c
+        JOIN processed_records p ON p.code = c.code AND p.serial = c.serial
+        ORDER BY c.rowid
+        """)
+        conflicts = {}
+        for code, serial, max_serial in cursor:
+            conflicts.setdefault(code, ([], max_serial))[0].append(serial)
+
+        return [
+            (code, serials, max_serial)
+            for code, (serials, max_serial) in conflicts.items()
+        ]
+
+    def _raise_counters(self, records: List[Tuple[str, int]]):
+        """指定流水号写入后，将计数表推进到各编码的最大流水号"""
+        max_serials = {}
+        for code, serial in records:
+            max_serials[code] = max(serial, max_serials.get(code, serial))
+
+        self.conn.executemany(
+            """
+            INSERT INTO serial_counters (code, last_serial) VALUES (?, ?)
+            ON CONFLICT(code) DO UPDATE
+            SET last_serial = MAX(last_serial, excluded.last_serial)
+            """,
+            max_serials.items(),
+        )
+
     def insert_records_with_begin_serial(
         self,
         codes: List[str],
@@ -84,43 +351,37 @@ class DatabaseManager:
             返回包含编码和流水号的元组列表
 
         Raises:
-            ValueError: 如果指定的流水号与已有记录冲突
+            SerialConflictError: 如果指定的流水号与已有记录冲突
         """
+        with self._lock:
+            return self._run_with_retry(self._insert_records, codes, begin_serial)
+
+    def _insert_records(
+        self, codes: List[str], begin_serial: Optional[int]
+    ) -> List[Tuple[str, int]]:
+        """在一个事务中分配流水号并写入记录"""
         results = []
 
         try:
             self.begin_transaction()
 
             if begin_serial is not None:
+                results = [(code, begin_serial + i) for i, code in enumerate(codes)]
                 # 检查所有编码是否都可用指定的起始流水号
-                for i, code in enumerate(codes):
-                    serial = begin_serial + i
-
-                    # 检查该流水号是否已存在
-                    cursor = self.conn.execute(
-                        "SELECT 1 FROM processed_records WHERE code = ? AND serial = ?",
-                        (code, serial),
-                    )
-                    if cursor.fetchone() is not None:
-                        max_serial = self.get_max_serial(code)
-                        raise ValueError(
-                            f"编码 '{code}' 的流水号 {serial} 已存在，当前最大流水号为 {max_serial}"
-                        )
+                conflicts = self.find_conflicts(results)
+                if conflicts:
+                    raise SerialConflictError(conflicts)
+
+                self._raise_counters(results)
+            else:
+                # 自动递增模式
+                results = self.reserve_serials(codes)
 
             # 插入所有记录
-            for i, code in enumerate(codes):
-                if begin_serial is not None:
-                    serial = begin_serial + i
-                else:
-                    # 自动递增模式
-                    max_serial = self.get_max_serial(code)
-                    serial = 1 if max_serial is None else max_serial + 1
-
-                self.conn.execute(
-                    "INSERT INTO processed_records (code, serial) VALUES (?, ?)",
-                    (code, serial),
-                )
-                results.append((code, serial))
+            self.conn.executemany(
+                "INSERT INTO processed_records (code, serial) VALUES (?, ?)",
+                results,
+            )
 
             self.commit_transaction()
             return results
@@ -136,20 +397,241 @@ class DatabaseManager:
             self.conn = None
 
 
+class ValueCell:
+    """流式读取时使用的轻量单元格，只提供 value/row/column"""
+
+    __slots__ = ("value", "row", "column")
+
+    def __init__(self, value, row: int, column: int):
+        self.value = value
+        self.row = row
+        self.column = column
+
+
+class DateNormalizer:
+    """日期格式化处理（函数1），输出两位年份的 yymmdd
+
+    按原始值做 LRU 缓存，同一日期重复出现时不再解析；
+    字符串优先尝试最近一次解析成功的格式；数字按Excel日期序列号直接换算。
+    """
+
+    FORMATS = ("%Y/%m/%d", "%Y-%m/%d", "%m/%d/%Y", "%m-%d-%Y")
+    OUTPUT_FORMAT = "%y%m%d"  # 改为 %y 获取两位年份
+    EXCEL_EPOCH_ORDINAL = datetime(1900, 1, 1).toordinal() - 2
+
+    def __init__(self, cache_size: int = 4096):
+        self.last_format = self.FORMATS[0]
+        # typed=True: 1 与 1.0 解析失败时的 str() 结果不同，不能共用缓存
+        self.normalize = lru_cache(maxsize=cache_size, typed=True)(self._normalize)
+
+    def __call__(self, cell: Cell, sheet: Worksheet) -> str:
+        value = cell.value
+        if isinstance(value, datetime):
+            return value.strftime(self.OUTPUT_FORMAT)
+        return self.normalize(value)
+
+    def normalize_column(self, values: List[Any]) -> List[str]:
+        """列函数版本"""
+        normalize = self.normalize
+        output_format = self.OUTPUT_FORMAT
+        return [
+            value.strftime(output_format) if isinstance(value, datetime) else normalize(value)
+            for value in values
+        ]
+
+    def _normalize(self, value) -> str:
+        """格式化单个原始值，无法识别时原样转为字符串"""
+        if isinstance(value, datetime):
+            return value.strftime(self.OUTPUT_FORMAT)
+        if isinstance(value, str):
+            dt = self._parse_str(value)
+            if dt is not None:
+                return dt.strftime(self.OUTPUT_FORMAT)
+        elif isinstance(value, (int, float)):
+            # Excel日期序列号快速路径
+            try:
+                dt = datetime.fromordinal(self.EXCEL_EPOCH_ORDINAL + int(value))
+                return dt.strftime(self.OUTPUT_FORMAT)
+            except (ValueError, OverflowError):
+                pass
+        return str(value)
+
+    def _parse_str(self, value: str) -> Optional[datetime]:
+        """按最近成功的格式优先解析字符串日期"""
+        try:
+            return datetime.strptime(value, self.last_format)
+        except ValueError:
+            pass
+        for fmt in self.FORMATS:
+            if fmt == self.last_format:
+                continue
+            try:
+                dt = datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+            self.last_format = fmt
+            return dt
+        return None
+
+
+def to_text_column(values: List[Any]) -> List[str]:
+    """函数0的列版本: 原样返回单元格值，空值为空字符串"""
+    return ["" if value is None else str(value) for value in values]
+
+
+def zero_pad(width: int) -> ColumnFunction:
+    """列函数: 左侧补零到指定宽度"""
+
+    def func(values: List[Any]) -> List[str]:
+        return [text.zfill(width) for text in to_text_column(values)]
+
+    return func
+
+
+def substring(start: int, end: Optional[int] = None) -> ColumnFunction:
+    """列函数: 截取子串，规则同 Python 切片"""
+
+    def func(values: List[Any]) -> List[str]:
+        return [text[start:end] for text in to_text_column(values)]
+
+    return func
+
+
+def upper_case() -> ColumnFunction:
+    """列函数: 转大写"""
+
+    def func(values: List[Any]) -> List[str]:
+        return [text.upper() for text in to_text_column(values)]
+
+    return func
+
+
+def lookup(mapping: Dict[str, str], default: Optional[str] = None) -> ColumnFunction:
+    """列函数: 按单元格文本查字典，未找到时返回default（为None则保留原文本）"""
+
+    def func(values: List[Any]) -> List[str]:
+        return [
+            mapping.get(text, text if default is None else default)
+            for text in to_text_column(values)
+        ]
+
+    return func
+
+
+# 内置列函数：索引 -> 工厂函数，参数由 ToolConfig.function_params 按索引提供
+BUILTIN_COLUMN_FUNCTIONS: Dict[int, Callable[..., ColumnFunction]] = {
+    2: zero_pad,
+    3: substring,
+    4: upper_case,
+    5: lookup,
+}
+
+
+def build_column_function(index: int, params: Dict[str, Any]) -> ColumnFunction:
+    """按参数创建内置列函数，索引不支持参数或参数不正确时抛出 ValueError"""
+    factory = BUILTIN_COLUMN_FUNCTIONS.get(index)
+    if factory is None:
+        raise ValueError(f"函数{index}不支持参数")
+    try:
+        return factory(**params)
+    except TypeError as e:
+        raise ValueError(f"函数{index}的参数不正确: {e}") from None
+
+
 class CellProcessor:
-    """单元格处理函数管理"""
+    """单元格处理函数管理
+
+    - register_function: 逐单元格函数 (cell, sheet) -> str
+    - register_column_function: 列函数 (整列值列表) -> 等长字符串列表
+    - register_column_factory: 按列创建上面两种函数，每个列位置各有一份，用于需要按列记住状态的函数
+    同一索引两种都有时，按列处理优先使用列函数；逐单元格函数通过适配器按列调用。
+    """
 
-    def __init__(self):
+    def __init__(self, function_params: Optional[Dict[int, Dict[str, Any]]] = None):
+        """
+        :param function_params: 内置列函数的参数，索引 -> 参数字典，见 BUILTIN_COLUMN_FUNCTIONS
+        """
         self.functions = {}
+        self.column_functions = {}
+        self.column_factories = {}
+        self._column_instances = {}  # (索引, 列位置) -> (逐单元格函数, 列函数)
+        self.function_params = function_params or {}
         self.register_default_functions()
 
     def register_function(self, index: int, func: Callable[[Cell, Worksheet], str]):
-        """注册处理函数"""
+        """注册处理函数（覆盖同索引的列函数）"""
         self.functions[index] = func
+        self.column_functions.pop(index, None)
+        self.column_factories.pop(index, None)
+
+    def register_column_function(self, index: int, func: ColumnFunction):
+        """注册列处理函数"""
+        self.column_functions[index] = func
+        self.column_factories.pop(index, None)
+
+    def register_column_factory(
+        self,
+        index: int,
+        factory: Callable[[], Tuple[Callable[[Cell, Worksheet], str], ColumnFunction]],
+    ):
+        """注册按列创建的处理函数，factory 返回 (逐单元格函数, 列函数)，每个列位置第一次用到时调用"""
+        self.column_factories[index] = factory
+        self.functions.pop(index, None)
+        self.column_functions.pop(index, None)
+
+    def _functions_for(
+        self, index: int, column: Optional[int]
+    ) -> Tuple[Optional[Callable[[Cell, Worksheet], str]], Optional[ColumnFunction]]:
+        """索引在该列位置上的 (逐单元格函数, 列函数)"""
+        if index not in self.column_factories:
+            return self.functions.get(index), self.column_functions.get(index)
+        key = (index, column)
+        functions = self._column_instances.get(key)
+        if functions is None:
+            functions = self._column_instances[key] = self.column_factories[index]()
+        return functions
+
+    def get_function(
+        self, index: int, column: Optional[int] = None
+    ) -> Callable[[Cell, Worksheet], str]:
+        """获取处理函数，column 为列位置（按列创建的函数每列一份）"""
+        func, column_func = self._functions_for(index, column)
+        if func is None and column_func is not None:
+            return lambda cell, sheet: column_func([cell.value])[0]
+        return func
+
+    def apply_column(
+        self, index: int, cells: List[Cell], sheet: Worksheet, column: Optional[int] = None
+    ) -> List[str]:
+        """对一整列单元格执行索引对应的处理函数，column 为列位置（按列创建的函数每列一份）"""
+        func, column_func = self._functions_for(index, column)
+        if column_func is not None:
+            values = [cell.value for cell in cells]
+            try:
+                return column_func(values)
+            except Exception:
+                # 整列失败时逐个重试，只把出错的单元格标记为错误
+                return self._apply_per_value(column_func, values)
 
-    def get_function(self, index: int) -> Callable[[Cell, Worksheet], str]:
-        """获取处理函数"""
-        return self.functions.get(index)
+        if func is None:
+            return to_text_column([cell.value for cell in cells])
+
+        results = []
+        for cell in cells:
+            try:
+                results.append(func(cell, sheet))
+            except Exception as e:
+                results.append(f"!ERROR({str(e)})")
+        return results
+
+    def _apply_per_value(self, column_func: ColumnFunction, values: List[Any]) -> List[str]:
+        results = []
+        for value in values:
+            try:
+                results.append(column_func([value])[0])
+            except Exception as e:
+                results.append(f"!ERROR({str(e)})")
+        return results
 
     def register_default_functions(self):
         """注册默认处理函数"""
@@ -157,35 +639,21 @@ class CellProcessor:
         self.register_function(
             0, lambda cell, sheet: str(cell.value) if cell.value is not None else ""
         )
+        self.register_column_function(0, to_text_column)
 
-        # 函数1: 日期格式化处理
-        def date_processor(cell: Cell, sheet: Worksheet) -> str:
-            value = cell.value
-            if isinstance(value, datetime):
-                return value.strftime("%y%m%d")  # 改为 %y 获取两位年份
-            try:
-                # 尝试解析Excel中的日期格式
-                if isinstance(value, str):
-                    for fmt in ("%Y/%m/%d", "%Y-%m/%d", "%m/%d/%Y", "%m-%d-%Y"):
-                        try:
-                            dt = datetime.strptime(value, fmt)
-                            return dt.strftime("%y%m%d")  # 改为 %y 获取两位年份
-                        except ValueError:
-                            continue
-                # 尝试处理Excel日期序列号
-                elif isinstance(value, (int, float)):
-                    try:
-                        dt = datetime.fromordinal(
-                            datetime(1900, 1, 1).toordinal() + int(value) - 2
-                        )
-                        return dt.strftime("%y%m%d")  # 改为 %y 获取两位年份
-                    except (ValueError, OverflowError):
-                        pass
-            except Exception:
-                pass
-            return str(value)
+        # 函数1: 日期格式化处理，每列一个 DateNormalizer，各列分别记住最近成功的格式
+        def date_functions():
+            date_normalizer = DateNormalizer()
+            return date_normalizer, date_normalizer.normalize_column
+
+        self.register_column_factory(1, date_functions)
 
-        self.register_function(1, date_processor)
+        # 函数4: 转大写，不需要参数
+        self.register_column_function(4, upper_case())
+
+        # 函数2补零(width)、3截取(start, end)、5查字典(mapping, default): 按参数注册
+        for index, params in self.function_params.items():
+            self.register_column_function(index, build_column_function(index, params))
 
 
 class RowResultBuilder:
@@ -208,6 +676,19 @@ class RowResultBuilder:
 
         return "".join(parts)
 
+    def build_columns(self, columns: List[List[str]]) -> List[str]:
+        """按列拼接，返回每行的结果字符串"""
+        if not columns:
+            return []
+
+        parts = [columns[0]]
+        for i in range(1, len(columns)):
+            if i <= len(self.separators):
+                parts.append(repeat(self.separators[i - 1]))
+            parts.append(columns[i])
+
+        return ["".join(row) for row in zip(*parts)]
+
 
 class RowProcessor:
     """行处理器"""
@@ -217,7 +698,7 @@ class RowProcessor:
         cell_processor: CellProcessor,
         func_indices: List[int],
         separator_builder: RowResultBuilder,
-        db_manager: DatabaseManager,
+        db_manager: Optional[DatabaseManager],
     ):
         self.cell_processor = cell_processor
         self.func_indices = func_indices
@@ -233,7 +714,7 @@ class RowProcessor:
         # 处理每个单元格
         for idx, cell in enumerate(row[: len(self.func_indices)]):
             func_index = self.func_indices[idx]
-            processor = self.cell_processor.get_function(func_index)
+            processor = self.cell_processor.get_function(func_index, idx)
             if processor:
                 try:
                     row_results.append(processor(cell, sheet))
@@ -247,6 +728,33 @@ class RowProcessor:
         self.codes.append(final_code)
         return final_code
 
+    def process_columns(self, rows: List[List[Cell]], sheet: Worksheet) -> List[str]:
+        """按列处理一批行并返回编码"""
+        columns = []
+        for idx, cells in enumerate(islice(zip(*rows), len(self.func_indices))):
+            columns.append(
+                self.cell_processor.apply_column(
+                    self.func_indices[idx], list(cells), sheet, idx
+                )
+            )
+
+        codes = self.separator_builder.build_columns(columns)
+        self.codes.extend(codes)
+        return codes
+
+    def process_rows(
+        self, rows: Iterable[List[Cell]], sheet: Worksheet, chunk_size: int = 10000
+    ) -> None:
+        """分批按列处理行迭代器，只缓存一批行数据"""
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                self.process_columns(chunk, sheet)
+                chunk = []
+        if chunk:
+            self.process_columns(chunk, sheet)
+
     def commit_records(
         self, begin_serial: Optional[int] = None
     ) -> List[Tuple[str, int]]:
@@ -262,50 +770,47 @@ class RowProcessor:
             raise e
 
 
-class ExcelProcessor:
-    """Excel处理器"""
+class ExcelReader:
+    """Excel读取器：读取指定范围并生成编码，不访问数据库"""
 
     def __init__(
         self,
         file_path: str,
         func_indices: List[int],
         separators: List[str],
-        db_path: Optional[str] = None,
-        num_zill=3,
+        function_params: Optional[Dict[int, Dict[str, Any]]] = None,
     ):
         self.file_path = file_path
         self.func_indices = func_indices
         self.separators = separators
-        self.db_manager = DatabaseManager(db_path) if db_path else DatabaseManager()
-        self.cell_processor = CellProcessor()
+        self.cell_processor = CellProcessor(function_params)
         self.row_processor = RowProcessor(
             cell_processor=self.cell_processor,
             func_indices=func_indices,
             separator_builder=RowResultBuilder(separators),
-            db_manager=self.db_manager,
+            db_manager=None,
         )
-        self.processed_records = []
-        self.num_zill = num_zill
 
-    def process_range(
+    def read_range(
         self,
         start_cell: str,
         end_cell: str,
-        begin_serial: Optional[int] = None,
         sheet_name: Optional[str] = None,
-    ):
-        """处理指定范围的数据
+        streaming: bool = True,
+    ) -> List[str]:
+        """读取指定范围并生成编码
 
         Args:
             start_cell: 起始单元格
             end_cell: 结束单元格
-            begin_serial: 指定的起始流水号
             sheet_name: 要处理的工作表名称，如果为None则使用活动工作表
+            streaming: 是否以只读流式方式读取，处理函数需要完整Cell对象时设为False
 
         Returns:
-            处理后的记录列表
+            待分配流水号的编码列表
         """
-        wb = load_workbook(self.file_path)
+        # 流式模式以只读方式打开，不在内存中保留整个工作簿
+        wb = load_workbook(self.file_path, read_only=streaming)
 
         # 获取指定工作表或活动工作表
         if sheet_name is not None:
@@ -317,29 +822,52 @@ class ExcelProcessor:
         start_col, start_row = self._parse_cell_ref(start_cell)
         end_col, end_row = self._parse_cell_ref(end_cell)
 
-        # 遍历每行并处理
-        for row_idx in range(start_row, end_row + 1):
-            row_cells = []
-            for col_idx in range(start_col, end_col + 1):
-                row_cells.append(sheet.cell(row=row_idx, column=col_idx))
-
-            # 处理行
-            try:
-                self.row_processor.process_row(row_cells, sheet)
-            except Exception as e:
-                wb.close()
-                raise e
+        if streaming:
+            rows = self._iter_value_rows(sheet, start_col, start_row, end_col, end_row)
+        else:
+            rows = self._iter_cell_rows(sheet, start_col, start_row, end_col, end_row)
 
-        # 提交所有记录
+        # 逐行处理
         try:
-            records = self.row_processor.commit_records(begin_serial)
-            self.processed_records.extend(records)
-        except Exception as e:
+            self.row_processor.process_rows(rows, sheet)
+        finally:
             wb.close()
-            raise e
+        return self.row_processor.codes
 
-        wb.close()
-        return self.processed_records
+    def _iter_cell_rows(
+        self, sheet: Worksheet, start_col: int, start_row: int, end_col: int, end_row: int
+    ) -> Iterator[List[Cell]]:
+        """完整加载模式：按行返回单元格对象"""
+        for row_idx in range(start_row, end_row + 1):
+            yield [
+                sheet.cell(row=row_idx, column=col_idx)
+                for col_idx in range(start_col, end_col + 1)
+            ]
+
+    def _iter_value_rows(
+        self, sheet: Worksheet, start_col: int, start_row: int, end_col: int, end_row: int
+    ) -> Iterator[List[ValueCell]]:
+        """流式模式：按行返回只含值的轻量单元格"""
+        row_idx = start_row
+        for values in sheet.iter_rows(
+            min_row=start_row,
+            max_row=end_row,
+            min_col=start_col,
+            max_col=end_col,
+            values_only=True,
+        ):
+            yield [
+                ValueCell(value, row_idx, col_idx)
+                for col_idx, value in enumerate(values, start=start_col)
+            ]
+            row_idx += 1
+
+        # 只读迭代在数据末尾提前结束，补齐空行以与完整加载模式一致
+        for row_idx in range(row_idx, end_row + 1):
+            yield [
+                ValueCell(None, row_idx, col_idx)
+                for col_idx in range(start_col, end_col + 1)
+            ]
 
     def _parse_cell_ref(self, cell_ref: str) -> Tuple[int, int]:
         """将单元格引用转换为行列索引"""
@@ -358,12 +886,64 @@ class ExcelProcessor:
 
         return (col_num, int(row_str))
 
+
+class ExcelProcessor(ExcelReader):
+    """Excel处理器"""
+
+    def __init__(
+        self,
+        file_path: str,
+        func_indices: List[int],
+        separators: List[str],
+        db_path: Optional[str] = None,
+        num_zill=3,
+        db_manager: Optional[DatabaseManager] = None,
+        function_params: Optional[Dict[int, Dict[str, Any]]] = None,
+    ):
+        super().__init__(file_path, func_indices, separators, function_params)
+        # 外部传入的数据库连接（如共享连接）由调用方负责关闭
+        self._owns_db_manager = db_manager is None
+        if db_manager is None:
+            db_manager = DatabaseManager(db_path) if db_path else DatabaseManager()
+        self.db_manager = db_manager
+        self.row_processor.db_manager = db_manager
+        self.processed_records = []
+        self.num_zill = num_zill
+
+    def process_range(
+        self,
+        start_cell: str,
+        end_cell: str,
+        begin_serial: Optional[int] = None,
+        sheet_name: Optional[str] = None,
+        streaming: bool = True,
+    ):
+        """处理指定范围的数据
+
+        Args:
+            start_cell: 起始单元格
+            end_cell: 结束单元格
+            begin_serial: 指定的起始流水号
+            sheet_name: 要处理的工作表名称，如果为None则使用活动工作表
+            streaming: 是否以只读流式方式读取，处理函数需要完整Cell对象时设为False
+
+        Returns:
+            处理后的记录列表
+        """
+        self.read_range(start_cell, end_cell, sheet_name, streaming)
+
+        # 提交所有记录
+        records = self.row_processor.commit_records(begin_serial)
+        self.processed_records.extend(records)
+        return self.processed_records
+
     def close(self):
         """关闭资源"""
-        if hasattr(self, "db_manager"):
+        if hasattr(self, "db_manager") and self._owns_db_manager:
             self.db_manager.close()
 
-    def pad_number(self, num: int, length: int):
+    @staticmethod
+    def pad_number(num: int, length: int):
         """数字补零"""
         return str(int(num)).zfill(length)
 
@@ -374,13 +954,104 @@ class ExcelProcessor:
         Returns:
             返回用换行符分隔的字符串，每行格式为 code + 补零后的serial
         """
-        result_lines = []
+        return self.format_records(records, self.num_zill)
+
+    @staticmethod
+    def iter_formatted(records: Iterable[Tuple[str, int]], num_zill: int) -> Iterator[str]:
+        """逐条生成格式化结果，每条为 code + 补零的serial"""
         for code, serial in records:
-            # 将每条记录格式化为 code + 补零的serial，并添加到结果列表
-            result_lines.append(f"{code}{self.pad_number(serial, self.num_zill)}")
+            yield f"{code}{ExcelProcessor.pad_number(serial, num_zill)}"
 
+    @staticmethod
+    def format_records(records: any, num_zill: int) -> str:
+        """按指定补位数格式化记录，不依赖处理器实例"""
         # 用换行符连接所有行并返回
-        return "\n".join(result_lines)
+        return "\n".join(ExcelProcessor.iter_formatted(records, num_zill))
+
+    def write_results(self, records: List[Tuple[str, int]], output_path: str) -> str:
+        """将结果写入文件，.txt 每行一个单号，.csv 包含编码/流水号/单号三列
+
+        Returns:
+            输出文件路径
+        """
+        if output_path.lower().endswith(".csv"):
+            with open(output_path, "w", encoding="utf-8-sig", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["编码", "流水号", "单号"])
+                for (code, serial), result in zip(
+                    records, self.iter_formatted(records, self.num_zill)
+                ):
+                    writer.writerow([code, serial, result])
+        else:
+            with open(output_path, "w", encoding="utf-8") as f:
+                for result in self.iter_formatted(records, self.num_zill):
+                    f.write(result)
+                    f.write("\n")
+        return output_path
+
+    def write_results_to_sheet(
+        self,
+        records: List[Tuple[str, int]],
+        output_path: str,
+        start_row: int,
+        sheet_name: Optional[str] = None,
+        column: Optional[int] = None,
+    ) -> str:
+        """将结果写回源工作表的新列，另存为新文件
+
+        以只读方式逐行读取源工作簿、写入只写模式的新工作簿，内存占用与行数无关；
+        只写模式只保留单元格值：所有工作表（不只是写入的工作表）的样式、合并单元格、
+        列宽等格式都会丢失，宏也无法保留，因此只支持输出为 .xlsx。
+
+        Args:
+            records: 与处理范围逐行对应的记录
+            output_path: 输出文件路径（.xlsx），不能与源文件相同
+            start_row: 第一条记录对应的行号
+            sheet_name: 写入的工作表名称，如果为None则使用活动工作表
+            column: 写入的列号（1-based），默认为工作表最后一列之后
+
+        Returns:
+            输出文件路径
+        """
+        if os.path.abspath(output_path) == os.path.abspath(self.file_path):
+            raise ValueError("输出文件不能与源文件相同")
+        if not output_path.lower().endswith(".xlsx"):
+            raise ValueError("写回工作表只支持输出为 .xlsx（只写模式无法保留 .xlsm 中的宏）")
+
+        source_wb = load_workbook(self.file_path, read_only=True)
+        output_wb = Workbook(write_only=True)
+        try:
+            target = source_wb[sheet_name] if sheet_name is not None else source_wb.active
+            results = self.iter_formatted(records, self.num_zill)
+            for sheet in source_wb.worksheets:
+                output_sheet = output_wb.create_sheet(sheet.title)
+                if sheet.title != target.title:
+                    for row in sheet.iter_rows(values_only=True):
+                        output_sheet.append(row)
+                    continue
+
+                result_col = column or (sheet.max_column or 0) + 1
+                row_idx = 0
+                for row_idx, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+                    values = list(row)
+                    if row_idx >= start_row:
+                        result = next(results, None)
+                        if result is not None:
+                            values.extend([None] * (result_col - len(values)))
+                            values[result_col - 1] = result
+                    output_sheet.append(values)
+
+                # 处理范围超出源数据的部分
+                for row_idx in range(row_idx + 1, start_row):
+                    output_sheet.append([])
+                for result in results:
+                    values = [None] * result_col
+                    values[result_col - 1] = result
+                    output_sheet.append(values)
+            output_wb.save(output_path)
+        finally:
+            source_wb.close()
+        return output_path
 
 
 def split_excel_range_str(data: str) -> List[str]:
@@ -396,11 +1067,18 @@ class ToolConfig(BaseModel):
         ..., pattern=r"^[A-Za-z]+\d+:[A-Za-z]+\d+$"
     )  # 使用正则表达式验证格式
     function_indices: List[int] = Field(..., min_items=1)
+    # 内置列函数的参数，如 {2: {"width": 6}, 3: {"start": 0, "end": 4}, 5: {"mapping": {...}}}
+    function_params: Dict[int, Dict[str, Any]] = Field({}, validate_default=True)
     separators: List[str]
     database_path: str
     begin_serial: Optional[int] = Field(..., ge=0)  # 大于等于0
     sheet_name: Optional[str] = "生成单号"
     num_zill: int = Field(..., ge=0)  # 输出格式化时流水号补位数
+    streaming: bool = True  # 只读流式读取，处理函数需要完整Cell对象时设为False
+    concurrent: bool = False  # 多人/多进程共用数据库时启用WAL和BEGIN IMMEDIATE
+    service_url: Optional[str] = None  # 流水号服务地址，设置后不直接访问数据库
+    # 结果输出文件：.txt/.csv 或 .xlsx（写回源工作表新列，只保留单元格值，源文件的格式全部丢失）
+    output_path: Optional[str] = None
 
     @field_validator("separators")
     @classmethod
@@ -414,22 +1092,164 @@ class ToolConfig(BaseModel):
             raise ValueError("分隔符数量必须与函数索引数量相同")
         return v
 
+    @field_validator("function_params")
+    @classmethod
+    def validate_function_params(
+        cls, v: Dict[int, Dict[str, Any]], info: FieldValidationInfo
+    ) -> Dict[int, Dict[str, Any]]:
+        """在读取工作簿之前检查内置列函数的参数，用到的函数2、3、5必须提供参数"""
+        used = set(info.data.get("function_indices", ())) & BUILTIN_COLUMN_FUNCTIONS.keys()
+        for index in sorted(used | v.keys()):
+            build_column_function(index, v.get(index, {}))
+        return v
+
+    @field_validator("output_path")
+    @classmethod
+    def validate_output_path(cls, v: Optional[str]) -> Optional[str]:
+        """在分配流水号之前拒绝无法写出的 .xlsm"""
+        if v and v.lower().endswith(".xlsm"):
+            raise ValueError("写回工作表只支持输出为 .xlsx（只写模式无法保留 .xlsm 中的宏）")
+        return v
+
+def open_db_manager(config: ToolConfig):
+    """按配置获取流水号分配后端：分配服务客户端或进程内共享的数据库连接"""
+    if config.service_url:
+        from .encoder_service import SerialServiceClient
+
+        return SerialServiceClient(config.service_url)
+    return DatabaseManager.shared(config.database_path, concurrent=config.concurrent)
+
+
 def run_tool(config: ToolConfig):
     """运行工具的主函数"""
+    db_manager = open_db_manager(config)
     p = ExcelProcessor(
         file_path=config.excel_file,
         func_indices=config.function_indices,
         separators=config.separators,
-        db_path=config.database_path,
         num_zill=config.num_zill,
+        db_manager=db_manager,
+        function_params=config.function_params,
     )
-    records = p.process_range(
-        start_cell=split_excel_range_str(config.range)[0],
-        end_cell=split_excel_range_str(config.range)[1],
-        begin_serial=config.begin_serial,
-        sheet_name=config.sheet_name,
-    )
-    return p.format_results(records)
+    try:
+        records = p.process_range(
+            start_cell=split_excel_range_str(config.range)[0],
+            end_cell=split_excel_range_str(config.range)[1],
+            begin_serial=config.begin_serial,
+            sheet_name=config.sheet_name,
+            streaming=config.streaming,
+        )
+    finally:
+        if config.service_url:
+            db_manager.close()
+
+    if not config.output_path:
+        return p.format_results(records)
+
+    if config.output_path.lower().endswith(".xlsx"):
+        start_row = p._parse_cell_ref(split_excel_range_str(config.range)[0])[1]
+        p.write_results_to_sheet(
+            records, config.output_path, start_row, sheet_name=config.sheet_name
+        )
+    else:
+        p.write_results(records, config.output_path)
+    return f"已生成{len(records)}条单号，结果已写入: {config.output_path}"
+
+
+class BatchJobResult(BaseModel):
+    """批量任务中单个任务的结果"""
+
+    index: int
+    excel_file: str
+    rows: int = 0
+    read_seconds: float = 0.0  # 子进程读取与转换耗时
+    commit_seconds: float = 0.0  # 分配流水号与写库耗时
+    output: str = ""
+    error: Optional[str] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        seconds = self.read_seconds + self.commit_seconds
+        return self.rows / seconds if seconds else 0.0
+
+
+class BatchResult(BaseModel):
+    """批量运行结果"""
+
+    jobs: List[BatchJobResult]
+    wall_seconds: float
+
+    def summary(self) -> str:
+        """每个任务的耗时与吞吐量汇总"""
+        lines = []
+        for job in self.jobs:
+            status = f"失败: {job.error}" if job.error else "成功"
+            lines.append(
+                f"[{job.index}] {job.excel_file} {job.rows}行 "
+                f"读取{job.read_seconds:.2f}秒 写库{job.commit_seconds:.2f}秒 "
+                f"{job.rows_per_second:.0f}行/秒 {status}"
+            )
+        total_rows = sum(job.rows for job in self.jobs)
+        lines.append(f"共{len(self.jobs)}个任务 {total_rows}行 总耗时{self.wall_seconds:.2f}秒")
+        return "\n".join(lines)
+
+
+def _read_job(config: ToolConfig) -> Tuple[List[str], float, Optional[str]]:
+    """子进程：读取并转换一个任务的工作簿，只生成编码"""
+    start = time.perf_counter()
+    try:
+        reader = ExcelReader(
+            file_path=config.excel_file,
+            func_indices=config.function_indices,
+            separators=config.separators,
+            function_params=config.function_params,
+        )
+        start_cell, end_cell = split_excel_range_str(config.range)
+        codes = reader.read_range(start_cell, end_cell, config.sheet_name, config.streaming)
+        return codes, time.perf_counter() - start, None
+    except Exception as e:
+        return [], time.perf_counter() - start, str(e)
+
+
+def run_batch(configs: List[ToolConfig], max_workers: Optional[int] = None) -> BatchResult:
+    """批量运行多个编码任务
+
+    工作簿的读取与转换在进程池中并行执行；流水号分配统一由当前进程按任务顺序写入，
+    因此同一编码的流水号顺序只取决于任务顺序。
+    """
+    start = time.perf_counter()
+    jobs = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # map 按提交顺序返回，后续任务在写库期间继续读取
+        for index, (config, (codes, read_seconds, error)) in enumerate(
+            zip(configs, executor.map(_read_job, configs))
+        ):
+            job = BatchJobResult(
+                index=index,
+                excel_file=config.excel_file,
+                rows=len(codes),
+                read_seconds=read_seconds,
+                error=error,
+            )
+            jobs.append(job)
+            if error:
+                continue
+
+            commit_start = time.perf_counter()
+            db_manager = open_db_manager(config)
+            try:
+                records = db_manager.insert_records_with_begin_serial(
+                    codes, config.begin_serial
+                )
+                job.output = ExcelProcessor.format_records(records, config.num_zill)
+            except Exception as e:
+                job.error = str(e)
+            finally:
+                if config.service_url:
+                    db_manager.close()
+            job.commit_seconds = time.perf_counter() - commit_start
+
+    return BatchResult(jobs=jobs, wall_seconds=time.perf_counter() - start)
 
 
 # 使用示例
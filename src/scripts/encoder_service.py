@@ -0,0 +1,216 @@
+import argparse
+import http.client
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .encoder import DatabaseManager, SerialConflictError
+
+
+class SerialAllocator:
+    """流水号分配器（hi/lo 块租用）
+
+    自动递增模式下，每个编码一次从数据库租用 block_size 个连续流水号，
+    之后在内存中依次发放，只有记录写入需要访问数据库。
+    指定起始流水号时先归还相关编码的租用区间，再交给 DatabaseManager 做冲突检查。
+    """
+
+    def __init__(self, db_manager: DatabaseManager, block_size: int = 1000):
+        self.db_manager = db_manager
+        self.block_size = block_size
+        self.leases: Dict[str, List[int]] = {}  # code -> [下一个可用流水号, 区间末尾]
+        self._lock = threading.Lock()
+
+    def allocate(
+        self, codes: List[str], begin_serial: Optional[int] = None
+    ) -> List[Tuple[str, int]]:
+        """分配流水号并写入记录，接口与 DatabaseManager.insert_records_with_begin_serial 一致"""
+        with self._lock:
+            if begin_serial is not None:
+                for code in set(codes):
+                    self._release(code)
+                return self.db_manager.insert_records_with_begin_serial(
+                    codes, begin_serial
+                )
+
+            self._ensure_leases(Counter(codes))
+            snapshot = {code: list(lease) for code, lease in self.leases.items()}
+            results = []
+            for code in codes:
+                lease = self.leases[code]
+                results.append((code, lease[0]))
+                lease[0] += 1
+
+            try:
+                self.db_manager.insert_allocated_records(results)
+            except Exception as e:
+                # 写入失败时放回本次发放的流水号，避免产生空缺
+                self.leases = snapshot
+                raise e
+            return results
+
+    def _ensure_leases(self, counts: Counter) -> None:
+        """租用区间不足的编码一次性续租"""
+        shortages = {}
+        for code, amount in counts.items():
+            lease = self.leases.get(code)
+            remaining = lease[1] - lease[0] + 1 if lease else 0
+            if remaining < amount:
+                shortages[code] = max(self.block_size, amount)
+        if not shortages:
+            return
+
+        first_serials = self.db_manager.lease_blocks(shortages)
+        for code, first_serial in first_serials.items():
+            last_serial = first_serial + shortages[code] - 1
+            lease = self.leases.get(code)
+            if lease and lease[0] <= lease[1] and lease[1] + 1 == first_serial:
+                # 新区间紧接旧区间，合并后继续按顺序发放
+                lease[1] = last_serial
+            else:
+                if lease and lease[0] <= lease[1]:
+                    self.db_manager.release_block(code, lease[0], lease[1])
+                self.leases[code] = [first_serial, last_serial]
+
+    def _release(self, code: str) -> None:
+        lease = self.leases.pop(code, None)
+        if lease and lease[0] <= lease[1]:
+            self.db_manager.release_block(code, lease[0], lease[1])
+
+    def close(self) -> None:
+        """归还所有未使用的租用区间"""
+        with self._lock:
+            for code in list(self.leases):
+                self._release(code)
+
+
+class _AllocatorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 保持长连接，避免每次请求重新握手
+    disable_nagle_algorithm = True  # 响应头和响应体分开写出，关闭Nagle避免40ms延迟确认
+
+    def do_POST(self):
+        # 长连接下必须先读完请求体，否则剩余数据会被当作下一个请求解析
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            self.close_connection = True
+            self._send(400, {"error": "Content-Length 无效"})
+            return
+        body = self.rfile.read(length)
+
+        if self.path != "/allocate":
+            self._send(404, {"error": f"未知路径 {self.path}"})
+            return
+
+        try:
+            payload = json.loads(body)
+            records = self.server.allocator.allocate(
+                payload["codes"], payload.get("begin_serial")
+            )
+            self._send(200, {"records": records})
+        except SerialConflictError as e:
+            self._send(409, {"error": str(e), "conflicts": e.conflicts})
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SerialService(ThreadingHTTPServer):
+    """本地流水号分配服务，独占SQLite文件，通过 localhost HTTP 提供分配接口"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        db_path: str,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        block_size: int = 1000,
+    ):
+        self.db_manager = DatabaseManager(db_path, concurrent=True)
+        self.allocator = SerialAllocator(self.db_manager, block_size)
+        super().__init__((host, port), _AllocatorHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def server_close(self) -> None:
+        """停止服务时归还未使用的流水号并关闭数据库"""
+        super().server_close()
+        self.allocator.close()
+        self.db_manager.close()
+
+
+class SerialServiceClient:
+    """分配服务客户端，可替代 DatabaseManager 传给 ExcelProcessor/RowProcessor"""
+
+    def __init__(self, url: str, timeout: float = 30):
+        parts = urlsplit(url)
+        self.url = url
+        self.conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+
+    def insert_records_with_begin_serial(
+        self,
+        codes: List[str],
+        begin_serial: Optional[int] = None,
+    ) -> List[Tuple[str, int]]:
+        """向服务申请流水号
+
+        Raises:
+            SerialConflictError: 如果指定的流水号与已有记录冲突
+            RuntimeError: 服务端其他错误
+        """
+        # 请求体为 bytes 时与请求头合并为一次发送
+        body = json.dumps({"codes": codes, "begin_serial": begin_serial}).encode("utf-8")
+        self.conn.request(
+            "POST", "/allocate", body, {"Content-Type": "application/json"}
+        )
+        response = self.conn.getresponse()
+        payload = json.loads(response.read())
+
+        if response.status == 409:
+            raise SerialConflictError([tuple(c) for c in payload["conflicts"]])
+        if response.status != 200:
+            raise RuntimeError(f"流水号服务错误: {payload.get('error')}")
+        return [(code, serial) for code, serial in payload["records"]]
+
+    def close(self):
+        """关闭连接"""
+        self.conn.close()
+
+
+# 启动服务: python -m scripts.encoder_service --db src/test/encoder/processing_records.db
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--db", required=True, help="数据库文件路径")
+    p.add_argument("--host", default="127.0.0.1", help="监听地址")
+    p.add_argument("--port", default=8765, type=int, help="监听端口")
+    p.add_argument("--block", default=1000, type=int, help="每次租用的流水号数量")
+    args = p.parse_args()
+
+    service = SerialService(args.db, args.host, args.port, args.block)
+    print(f"流水号服务已启动: {service.url}")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.server_close()
+        print("流水号服务已停止，未使用的流水号已归还")
@@ -1,9 +1,40 @@
 import openpyxl
 from openpyxl.cell import Cell
 from openpyxl.worksheet.worksheet import Worksheet
-from openpyxl.utils import column_index_from_string
+from openpyxl.utils import get_column_letter, range_boundaries
+import argparse
+import csv
+import hashlib
+import multiprocessing
 import os
 import json
+import pickle
+import re
+import sqlite3
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from operator import itemgetter
+
+# 查找表索引缓存的默认位置
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".erp_consultant_tools", "smap_cache.db"
+)
+
+# 流式模式下每批按列处理的行数
+STREAMING_CHUNK_ROWS = 10000
+
+
+class _ValueCell:
+    """流式模式下传给匹配处理器的轻量单元格，只提供 value"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
 
 
 class MatchHandler:
@@ -61,6 +92,603 @@ class EmptyOrKeep(MatchHandler):
         # 如果是"keep"则不做任何操作（保留原值）
 
 
+class KeyNormalizer:
+    """
+    查找键归一化
+
+    可选规则（按以下顺序执行）：
+    - width: 全角/半角折叠（NFKC），如"ＡＢ１"→"AB1"
+    - trim: 去除首尾空白
+    - casefold: 忽略大小写
+    - numeric: 数字规范化，123、123.0、"123"、"123.0"统一为"123"；
+      只转换普通十进制写法的文本，以0开头的数字串（如"00123"）和科学计数法（如"1E5"）视为编码，不做转换
+
+    按原始值做 LRU 缓存，同一个值重复出现时只归一化一次；复合键（元组）逐项归一化
+    """
+
+    RULES = ("width", "trim", "casefold", "numeric")
+    _PLAIN_NUMBER = re.compile(r"[+-]?\d+(\.\d+)?")
+
+    def __init__(self, rules: list | tuple = RULES, cache_size: int = 65536):
+        """
+        :param rules: 启用的规则列表，取值见 RULES
+        :param cache_size: 缓存的不同值数量上限
+        """
+        unknown = set(rules) - set(self.RULES)
+        if unknown:
+            raise ValueError(f"不支持的归一化规则: {', '.join(sorted(unknown))}")
+        self.rules = frozenset(rules)
+        self.normalize = lru_cache(maxsize=cache_size, typed=True)(self._normalize)
+
+    def __call__(self, value):
+        if isinstance(value, tuple):
+            return tuple(map(self.normalize, value))
+        return self.normalize(value)
+
+    def _normalize(self, value):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return self._canonical_number(value) if "numeric" in self.rules else value
+        if not isinstance(value, str):
+            return value  # 日期等其他类型保持原值
+
+        if "width" in self.rules:
+            value = unicodedata.normalize("NFKC", value)
+        if "trim" in self.rules:
+            value = value.strip()
+        if "casefold" in self.rules:
+            value = value.casefold()
+        if "numeric" in self.rules:
+            number = self._parse_number(value)
+            if number is not None:
+                return self._canonical_number(number)
+        return value
+
+    @classmethod
+    def _parse_number(cls, text: str) -> Decimal | None:
+        if not cls._PLAIN_NUMBER.fullmatch(text):
+            return None
+        digits = text.lstrip("+-")
+        if len(digits) > 1 and digits[0] == "0" and digits[1].isdigit():
+            return None
+        return Decimal(text)
+
+    @staticmethod
+    def _canonical_number(number) -> str:
+        if isinstance(number, float):
+            if number != number or number in (float("inf"), float("-inf")):
+                return str(number)
+            number = Decimal(repr(number))
+        elif isinstance(number, int):
+            return str(number)
+        if number.is_zero():
+            return "0"
+        if number == number.to_integral_value():
+            # 不经过int()，超长数字串不受整数转字符串的位数限制
+            return format(number.to_integral_value(), "f")
+        return format(number.normalize(), "f")
+
+
+def parse_range(range_str: str) -> tuple:
+    """
+    解析范围字符串，支持多字母列（如"AA2:AB900"）
+
+    :return: (起始列, 起始行, 结束列, 结束行)，列号从1开始
+    """
+    return range_boundaries(range_str.strip())
+
+
+def _lookup_entry(row, key_of, value_of, multi_value: bool) -> tuple:
+    """
+    从一行中取出 (键, 值)；多列值全部为空时视为None，与单列空值一致
+
+    :param key_of: 取键的itemgetter，多列时返回元组（复合键）
+    :param value_of: 取值的itemgetter，多列时返回元组
+    """
+    value = value_of(row)
+    if multi_value and all(v is None for v in value):
+        value = None
+    return key_of(row), value
+
+
+def _is_blank_key(key) -> bool:
+    """键为空（复合键的每一项都为空）"""
+    if isinstance(key, tuple):
+        return all(v is None for v in key)
+    return key is None
+
+
+class LookupSource:
+    """
+    查找数据源，字段配置可以是单个数据源或按优先级排列的数据源列表
+
+    - 范围字符串: "A2:B2853"，即lookup_path活动Sheet中的范围（原有写法）
+    - Excel: {"path": "对照表.xlsx", "sheet": "Sheet2", "range": "A2:B900"}，
+      path省略时为lookup_path，sheet省略时为活动Sheet
+    - CSV/Parquet: {"path": "物料.csv", "key": "旧品号", "value": "新品号"}，
+      key/value为列名，省略时取前两列；CSV可指定encoding（默认utf-8-sig）
+
+    复合键/多列返回时（见FieldMapping），Excel范围中前key_width列为键、随后value_width列为值；
+    CSV/Parquet的key/value写为列名列表，省略时按顺序取前面的列
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sheet: str = None,
+        range_str: str = None,
+        key: str | list = None,
+        value: str | list = None,
+        encoding: str = "utf-8-sig",
+        key_width: int = 1,
+        value_width: int = 1,
+    ):
+        if not path:
+            raise ValueError("查找数据源缺少文件路径")
+        self.path = path
+        self.sheet = sheet
+        self.range_str = range_str
+        self.key = [key] if isinstance(key, str) else key
+        self.value = [value] if isinstance(value, str) else value
+        self.encoding = encoding
+        self.key_width = key_width
+        self.value_width = value_width
+
+        ext = os.path.splitext(path)[1].lower()
+        self.kind = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}.get(ext, "excel")
+        if self.kind == "excel" and not range_str:
+            raise ValueError(f"Excel查找数据源缺少范围: {path}")
+        if self.key and len(self.key) != key_width:
+            raise ValueError(f"数据源键列数量应为{key_width}: {path}")
+        if self.value and len(self.value) != value_width:
+            raise ValueError(f"数据源值列数量应为{value_width}: {path}")
+
+    @classmethod
+    def parse(cls, spec, default_path: str = None, key_width: int = 1, value_width: int = 1) -> list:
+        """
+        解析字段配置
+
+        :param spec: 范围字符串、数据源字典或它们的列表
+        :param default_path: 未指定path时使用的查找表路径
+        :param key_width: 键的列数（复合键时大于1）
+        :param value_width: 值的列数（多列返回时大于1）
+        :return: 按优先级排列的LookupSource列表
+        """
+        sources = []
+        for item in spec if isinstance(spec, list) else [spec]:
+            if isinstance(item, str):
+                item = {"range": item}
+            unknown = set(item) - {"path", "sheet", "range", "key", "value", "encoding"}
+            if unknown:
+                raise ValueError(f"不支持的数据源配置项: {', '.join(sorted(unknown))}")
+            options = {k: v for k, v in item.items() if k not in ("path", "range")}
+            sources.append(
+                cls(
+                    item.get("path") or default_path,
+                    range_str=item.get("range"),
+                    key_width=key_width,
+                    value_width=value_width,
+                    **options,
+                )
+            )
+        return sources
+
+    @property
+    def cache_key(self) -> str:
+        """缓存中区分同一文件不同数据源的键（活动Sheet的单键单值范围保持原有写法）"""
+        if self.kind == "excel":
+            range_key = f"{self.sheet}!{self.range_str}" if self.sheet else self.range_str
+            if (self.key_width, self.value_width) != (1, 1):
+                range_key += f"#{self.key_width}:{self.value_width}"
+            return range_key
+
+        def columns(names, width):
+            return ",".join(names) if names else ("" if width == 1 else f"#{width}")
+
+        return (
+            f"{self.kind}:{columns(self.key, self.key_width)}"
+            f":{columns(self.value, self.value_width)}"
+        )
+
+    def getters(self, key_start: int = 0) -> tuple:
+        """
+        返回按位置取键和值的itemgetter，键从key_start列开始、值紧随其后
+
+        :return: (取键函数, 取值函数)
+        """
+        key_idx = range(key_start, key_start + self.key_width)
+        value_idx = range(key_start + self.key_width, key_start + self.key_width + self.value_width)
+        return itemgetter(*key_idx), itemgetter(*value_idx)
+
+    def read_table(self) -> dict:
+        """
+        读取CSV/Parquet数据源，保留键第一次出现的值
+
+        CSV使用标准库的C解析器，Parquet使用pyarrow（按需导入），均不经过openpyxl
+        """
+        multi_value = self.value_width > 1
+        if self.kind == "parquet":
+            import pyarrow.parquet as pq
+
+            columns = self.key + self.value if self.key and self.value else None
+            table = pq.read_table(self.path, columns=columns)
+            names = table.column_names
+            key_names = self.key or names[: self.key_width]
+            value_names = self.value or names[self.key_width : self.key_width + self.value_width]
+            rows = zip(*(table.column(name).to_pylist() for name in key_names + value_names))
+            key_of, value_of = self.getters()
+            entries = (_lookup_entry(row, key_of, value_of, multi_value) for row in rows)
+            return self._first_wins(entries)
+
+        with open(self.path, newline="", encoding=self.encoding) as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            key_idx = [header.index(name) for name in self.key] if self.key else range(self.key_width)
+            value_idx = (
+                [header.index(name) for name in self.value]
+                if self.value
+                else range(self.key_width, self.key_width + self.value_width)
+            )
+            width = max(*key_idx, *value_idx) + 1
+            pick = itemgetter(*key_idx, *value_idx)  # 先取出键列和值列，再按位置拆分
+            key_of, value_of = self.getters()
+            # 空字符串与Excel空单元格一致，视为None
+            entries = (
+                _lookup_entry([v or None for v in pick(row)], key_of, value_of, multi_value)
+                for row in reader
+                if len(row) >= width
+            )
+            return self._first_wins(entries)
+
+    @staticmethod
+    def _first_wins(entries) -> dict:
+        table_dict = {}
+        for key, value in entries:
+            if key not in table_dict:
+                table_dict[key] = value
+        return table_dict
+
+
+class FieldMapping:
+    """
+    字段映射：按目标文件中的键列查找，把结果写入一个或多个目标列
+
+    - 简单写法: {"元件品号": <数据源>}，按"元件品号"列查找并原地替换（原有写法）
+    - 完整写法: {"新品号": {"match": ["工厂", "品号"], "write": ["新品号", "单位"], "source": <数据源>}}，
+      match为组成复合键的列头，write为要写入的列头，省略时均为映射名本身；
+      复合键在每个目标行只构造一次，一次查找填充所有write列
+
+    <数据源>的写法见LookupSource
+    """
+
+    def __init__(self, name: str, match: list, write: list, sources: list):
+        self.name = name
+        self.match = match
+        self.write = write
+        self.sources = sources
+
+    @classmethod
+    def parse(cls, name: str, spec, default_path: str = None) -> "FieldMapping":
+        """
+        解析一项字段配置
+
+        :param name: 配置中的字段名
+        :param spec: 数据源写法，或包含source的完整写法字典
+        :param default_path: 未指定path时使用的查找表路径
+        """
+        if not (isinstance(spec, dict) and "source" in spec):
+            return cls(name, [name], [name], LookupSource.parse(spec, default_path))
+
+        unknown = set(spec) - {"match", "write", "source"}
+        if unknown:
+            raise ValueError(f"不支持的字段配置项: {', '.join(sorted(unknown))}")
+        match = spec.get("match") or [name]
+        write = spec.get("write") or [name]
+        match = [match] if isinstance(match, str) else list(match)
+        write = [write] if isinstance(write, str) else list(write)
+        sources = LookupSource.parse(spec["source"], default_path, len(match), len(write))
+        return cls(name, match, write, sources)
+
+
+class LookupIndexCache:
+    """
+    查找表索引的磁盘缓存（SQLite）
+
+    以查找表文件路径 + 文件大小 + 修改时间 + 范围字符串为键，保存解析后的查找字典；
+    查找表文件变化后对应缓存自动失效，热启动时无需再用openpyxl解析查找表。
+
+    查找字典按JSON保存（元组、日期时间等加类型标记），读取缓存不会执行任何代码；
+    含其他类型值的查找字典不缓存，无法解析的缓存视为未命中
+    """
+
+    # 类型标记 -> 解码函数，对应 _encode_value 中的标记
+    _DECODERS = {
+        "tuple": tuple,
+        "datetime": datetime.fromisoformat,
+        "date": date.fromisoformat,
+        "time": time.fromisoformat,
+        "timedelta": lambda args: timedelta(*args),
+    }
+
+    def __init__(self, cache_path: str = None):
+        """
+        :param cache_path: 缓存数据库路径，None则使用DEFAULT_CACHE_PATH
+        """
+        self.cache_path = cache_path or DEFAULT_CACHE_PATH
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.cache_path)
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS lookup_index (
+            path TEXT NOT NULL,
+            range_str TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            PRIMARY KEY (path, range_str)
+        )
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def _file_stamp(lookup_path: str) -> tuple:
+        """返回 (绝对路径, 文件大小, 修改时间)"""
+        stat = os.stat(lookup_path)
+        return os.path.abspath(lookup_path), stat.st_size, stat.st_mtime_ns
+
+    def get(self, lookup_path: str, range_str: str) -> dict | None:
+        """
+        读取缓存的查找字典
+
+        :return: 查找字典，未命中或已失效返回None
+        """
+        path, size, mtime_ns = self._file_stamp(lookup_path)
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, data FROM lookup_index WHERE path = ? AND range_str = ?",
+            (path, range_str),
+        ).fetchone()
+        if row is None:
+            return None
+        if (row[0], row[1]) != (size, mtime_ns):
+            # 查找表已修改，清除该文件的所有旧缓存
+            self.conn.execute(
+                "DELETE FROM lookup_index WHERE path = ? AND (size != ? OR mtime_ns != ?)",
+                (path, size, mtime_ns),
+            )
+            self.conn.commit()
+            return None
+        try:
+            return dict(json.loads(row[2], object_hook=self._decode_value))
+        except (ValueError, TypeError, KeyError):
+            # 旧版本或被改动的缓存，下次读取查找表后覆盖
+            return None
+
+    def put(self, lookup_path: str, range_str: str, data: dict) -> None:
+        """写入查找字典，含不支持类型的值时不写入"""
+        try:
+            pairs = [[self._encode_value(k), self._encode_value(v)] for k, v in data.items()]
+            encoded = json.dumps(pairs, ensure_ascii=False)
+        except TypeError:
+            return
+        path, size, mtime_ns = self._file_stamp(lookup_path)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO lookup_index (path, range_str, size, mtime_ns, data) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (path, range_str, size, mtime_ns, encoded),
+        )
+        self.conn.commit()
+
+    @classmethod
+    def _encode_value(cls, value):
+        """查找字典的键或值转为JSON可保存的形式"""
+        if value is None or type(value) in (str, int, float, bool):
+            return value
+        if type(value) is tuple:
+            return {"tuple": [cls._encode_value(item) for item in value]}
+        if type(value) in (datetime, date, time):
+            return {type(value).__name__: value.isoformat()}
+        if type(value) is timedelta:
+            return {"timedelta": [value.days, value.seconds, value.microseconds]}
+        raise TypeError(f"不支持缓存的类型: {type(value).__name__}")
+
+    @classmethod
+    def _decode_value(cls, obj: dict):
+        """json.loads的object_hook：按类型标记还原"""
+        (tag, value), = obj.items()
+        return cls._DECODERS[tag](value)
+
+    def close(self) -> None:
+        """关闭缓存数据库"""
+        self.conn.close()
+
+
+class ChangeSet:
+    """
+    试运行（Smap.preview）得到的变更集
+
+    - changes: [(Sheet名, 单元格, 字段, 原值, 新值), ...]，只包含值发生变化的单元格
+    - stats: 字段 -> Counter(hit=匹配行数, miss=未匹配行数, blank=键为空的行数)
+    """
+
+    COLUMNS = ("sheet", "cell", "field", "old", "new")
+
+    def __init__(self, changes: list = None, stats: dict = None):
+        self.changes = changes if changes is not None else []
+        self.stats = stats if stats is not None else {}
+
+    def save(self, path: str) -> str:
+        """按扩展名导出为CSV或JSONL（.jsonl/.json）"""
+        ext = os.path.splitext(path)[1].lower()
+        if ext in (".jsonl", ".json"):
+            return self.to_jsonl(path)
+        return self.to_csv(path)
+
+    def to_csv(self, path: str) -> str:
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.COLUMNS)
+            writer.writerows(self.changes)
+        return path
+
+    def to_jsonl(self, path: str) -> str:
+        with open(path, "w", encoding="utf-8") as f:
+            for change in self.changes:
+                record = dict(zip(self.COLUMNS, change))
+                # 日期等无法直接序列化的值按字符串输出
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        return path
+
+
+class RowManifest:
+    """
+    增量处理清单，保存在输出文件旁（<输出文件>.manifest）
+
+    记录上次运行的处理设置、目标/输出文件标识、各字段查找字典中每个键的摘要
+    （键摘要 -> 查找值摘要，启用键归一化时另有归一化查找字典的摘要），
+    以及每个Sheet每个数据行的指纹（映射相关列的原始值）、写入列的输出值和各字段的匹配结果
+    """
+
+    VERSION = 3
+    DIGEST_SIZE = 8  # 查找键、查找值摘要的字节数
+    HIT, MISS, BLANK = 0, 1, 2  # 行匹配结果代码，与field_stats的hit、miss、blank对应
+    OUTCOMES = ("hit", "miss", "blank")
+
+    def __init__(self, output_path: str):
+        self.path = output_path + ".manifest"
+        self.previous = self._load()
+        # Sheet名 -> (字段名元组, {行号: (指纹, 写入列输出值, 各字段匹配结果代码)})
+        self.sheets = {}
+
+    def _load(self) -> dict | None:
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return data if isinstance(data, dict) and data.get("version") == self.VERSION else None
+
+    @staticmethod
+    def fingerprint(values) -> bytes:
+        """行指纹，repr区分1与1.0、"1"等不同类型的值"""
+        return hashlib.blake2b(repr(values).encode(), digest_size=16).digest()
+
+    @staticmethod
+    def file_stamp(path: str) -> tuple | None:
+        """返回 (文件大小, 修改时间)，文件不存在返回None"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def usable(self, settings: str) -> bool:
+        """上次运行的清单存在且处理设置相同"""
+        return self.previous is not None and self.previous["settings"] == settings
+
+    @classmethod
+    def _key_text(cls, key) -> str:
+        """键的文本形式：字典中相等的键（如1、1.0、True）得到相同的文本，复合键逐项转换"""
+        if isinstance(key, tuple):
+            return "(" + ",".join(map(cls._key_text, key)) + ")"
+        if isinstance(key, bool):
+            key = int(key)
+        elif isinstance(key, float) and key.is_integer():
+            key = int(key)
+        return repr(key)
+
+    @classmethod
+    def key_digest(cls, key) -> bytes:
+        return hashlib.blake2b(cls._key_text(key).encode(), digest_size=cls.DIGEST_SIZE).digest()
+
+    @classmethod
+    def key_digests(cls, lookup_map: dict) -> dict:
+        """
+        查找字典每个键的摘要：键摘要 -> 查找值摘要，清单中只保存摘要而不是整个字典
+
+        不同的键摘要相同时合并两者的查找值摘要，任一项变化都能被发现
+        """
+        size = cls.DIGEST_SIZE
+        digests = {}
+        for key, value in lookup_map.items():
+            key_digest = cls.key_digest(key)
+            value_digest = hashlib.blake2b(repr(value).encode(), digest_size=size).digest()
+            if key_digest in digests:
+                value_digest = hashlib.blake2b(
+                    digests[key_digest] + value_digest, digest_size=size
+                ).digest()
+            digests[key_digest] = value_digest
+        return digests
+
+    def changed_keys(self, lookup_digests: dict) -> dict:
+        """
+        对比上次运行的查找字典摘要
+
+        :param lookup_digests: 字段 -> (查找字典的键摘要, 归一化查找字典的键摘要或None)，见key_digests
+        :return: 字段 -> (有变化的键摘要集合, 有变化的归一化键摘要集合)，只包含有变化的字段
+        """
+        changed = {}
+        for field, digests in lookup_digests.items():
+            previous = self.previous["lookup"].get(field)
+            if previous == digests:
+                continue
+            if previous is None:
+                previous = ({}, None)
+            changed[field] = tuple(
+                self._changed(old or {}, new or {}) for old, new in zip(previous, digests)
+            )
+        return changed
+
+    @staticmethod
+    def _changed(old: dict, new: dict) -> set:
+        """新增、删除或查找值有变化的键摘要"""
+        return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
+    def previous_stats(self):
+        """
+        上次运行所有行的字段匹配统计
+
+        :return: 迭代 (字段名, Counter(hit, miss, blank))
+        """
+        for fields, rows in self.previous["sheets"].values():
+            yield from self.count_outcomes(fields, (entry[2] for entry in rows.values()))
+
+    @classmethod
+    def count_outcomes(cls, fields: tuple, outcomes):
+        """
+        统计各字段的匹配结果代码
+
+        :param outcomes: 每行一个结果代码序列（与fields顺序一致）
+        :return: 迭代 (字段名, Counter(hit, miss, blank))
+        """
+        tallies = [[0, 0, 0] for _ in fields]
+        for codes in outcomes:
+            for tally, code in zip(tallies, codes):
+                tally[code] += 1
+        for field, tally in zip(fields, tallies):
+            yield field, Counter(dict(zip(cls.OUTCOMES, tally)))
+
+    def save(
+        self, settings: str, target_path: str, output_path: str, lookup_digests: dict
+    ) -> None:
+        """
+        写入本次运行的清单（先写临时文件再替换，避免中断时留下残缺清单）
+
+        :param lookup_digests: 见changed_keys
+        """
+        data = {
+            "version": self.VERSION,
+            "settings": settings,
+            "target": self.file_stamp(target_path),
+            "output": self.file_stamp(output_path),
+            "lookup": lookup_digests,
+            "sheets": self.sheets,
+        }
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.path)
+
+
 class Smap:
     """
     Excel跨文件VLOOKUP处理器
@@ -87,18 +715,33 @@ class Smap:
         sheet_names: list = None,
         suffix: str = "_processed",
         match_handler: MatchHandler = None,
+        cache: str = "bypass",
+        cache_path: str = None,
+        mode: str = "full",
+        engine: str = "python",
+        normalize: list | tuple = None,
+        incremental: bool = False,
     ):
         """
         初始化处理器
 
         :param target_path: 待处理Excel文件路径
-        :param lookup_path: 查找表Excel文件路径
+        :param lookup_path: 查找表Excel文件路径（数据源未指定path时使用）
         :param header_row: 列头所在行号（1-based）
         :param skip_rows: 跳过行数（从列头行之后开始计算）
-        :param config: 定义字段和查找范围（优先级高于JSON配置）
+        :param config: 定义字段和查找范围（优先级高于JSON配置），写法见FieldMapping和LookupSource
         :param sheet_names: 指定处理的Sheet名称列表，None表示处理所有Sheet
         :param suffix: 输出文件后缀（默认添加'_processed'）
         :param match_handler: 自定义匹配处理器实例，None则使用默认处理器
+        :param cache: 查找表索引缓存策略，"bypass"不读写缓存（默认）、"use"使用缓存、"rebuild"重建缓存
+        :param cache_path: 缓存数据库路径，None则使用DEFAULT_CACHE_PATH
+        :param mode: "full"完整加载目标文件（保留样式）；"streaming"逐行读写（仅保留值，适合大文件）
+        :param engine: 查找替换引擎，"python"逐单元格调用匹配处理器；
+            "pandas"整列哈希连接（需要安装pandas，仅支持EmptyOrKeep处理器）
+        :param normalize: 键归一化规则（见KeyNormalizer.RULES），精确匹配失败时再按归一化后的键查找；
+            None表示只做精确匹配
+        :param incremental: 增量处理（仅流式模式），在输出文件旁保存行指纹清单，
+            再次运行时只重新计算输入值有变化、或键对应的查找项有变化的行
         """
         # 初始化参数
         self.target_path = target_path
@@ -108,17 +751,41 @@ class Smap:
         if type(config) is str:
             config: dict = json.loads(config)
         self.config: dict = config
+        self.mappings = {
+            field: FieldMapping.parse(field, spec, lookup_path) for field, spec in config.items()
+        }
         self.header_row = header_row
         self.skip_rows = skip_rows
         self.sheet_names = sheet_names if sheet_names else []  # 空列表表示处理所有Sheet
         self.suffix = suffix
+        if cache not in ("use", "bypass", "rebuild"):
+            raise ValueError(f"不支持的缓存策略: {cache}")
+        self.cache = cache
+        self.cache_path = cache_path
+        if mode not in ("full", "streaming"):
+            raise ValueError(f"不支持的处理模式: {mode}")
+        self.mode = mode
+        if incremental and mode != "streaming":
+            raise ValueError("增量处理只支持流式模式")
+        self.incremental = incremental
 
         # 初始化处理程序
         self.match_handler = match_handler or EmptyOrKeep()  # 默认使用EmptyOrKeep策略
+        if engine not in ("python", "pandas"):
+            raise ValueError(f"不支持的查找引擎: {engine}")
+        if engine == "pandas" and type(self.match_handler) is not EmptyOrKeep:
+            raise ValueError("pandas引擎只支持EmptyOrKeep匹配处理器")
+        self.engine = engine
+        self.key_normalizer = KeyNormalizer(normalize) if normalize else None
 
         # 运行时数据
         self.lookup_data = {}  # 存储加载的查找表数据
         self.target_wb = None  # 目标工作簿对象
+        self._pandas_index = {}  # pandas引擎：字段 -> (键索引, 整体值数组, 各写入列的值数组)
+        self._normalized_index = {}  # 字段 -> 归一化键的查找字典
+        self.normalized_hits = Counter()  # 字段 -> 仅因归一化才匹配成功的行数
+        self.field_stats = {}  # 字段 -> Counter(hit, miss, blank)
+        self.incremental_stats = Counter()  # 增量处理：reused沿用的行数、recomputed重新计算的行数
 
     def process(self) -> str:
         """
@@ -126,45 +793,226 @@ class Smap:
 
         :return: 处理后的文件保存路径
         """
-        self._load_lookup_data()
+        if not self.lookup_data:  # 并行执行时查找表由主进程预先加载
+            self._load_lookup_data()
+        if self.mode == "streaming":
+            return self._process_target_streaming()
         self._process_target_file()
         return self._save_processed_file()
 
+    def preview(self) -> ChangeSet:
+        """
+        试运行：以只读模式流式读取目标文件，只计算变更集，不修改也不保存工作簿
+
+        替换逻辑与流式模式相同（包括匹配处理器、引擎和键归一化）
+
+        :return: 变更集，包含变化的单元格和各字段的匹配统计
+        """
+        if not self.lookup_data:
+            self._load_lookup_data()
+        source_wb = openpyxl.load_workbook(self.target_path, read_only=True)
+        # 计算数据起始行（表头行 + 跳过的行数 + 1）
+        start_row = self.header_row + self.skip_rows + 1
+        changes = []
+
+        try:
+            for sheet in source_wb.worksheets:
+                if self.sheet_names and sheet.title not in self.sheet_names:
+                    continue
+                columns = self._streaming_columns(sheet)
+                if not columns:
+                    continue
+                # 只比较写入列：列下标 -> (列字母, 字段)
+                write_columns = {
+                    col_idx: (get_column_letter(col_idx + 1), field)
+                    for field, _, write_idx in columns
+                    for col_idx in write_idx
+                }
+
+                chunk, originals = [], []
+                rows = sheet.iter_rows(min_row=start_row, values_only=True)
+                for row_idx, row in enumerate(rows, start=start_row):
+                    chunk.append(list(row))
+                    originals.append((row_idx, row))
+                    if len(chunk) >= STREAMING_CHUNK_ROWS:
+                        self._transform_chunk(chunk, columns)
+                        self._collect_changes(changes, sheet.title, write_columns, originals, chunk)
+                        chunk, originals = [], []
+                self._transform_chunk(chunk, columns)
+                self._collect_changes(changes, sheet.title, write_columns, originals, chunk)
+        finally:
+            source_wb.close()
+        return ChangeSet(changes, self.field_stats)
+
+    @staticmethod
+    def _collect_changes(
+        changes: list, title: str, write_columns: dict, originals: list, chunk: list
+    ) -> None:
+        """比较一批行替换前后的写入列，记录发生变化的单元格"""
+        for (row_idx, row), values in zip(originals, chunk):
+            for col_idx, (letter, field) in write_columns.items():
+                old = row[col_idx] if col_idx < len(row) else None
+                new = values[col_idx]
+                if old != new:
+                    changes.append((title, f"{letter}{row_idx}", field, old, new))
+
     def _load_lookup_data(self) -> None:
         """
         加载查找表数据到内存
 
-        根据config中的配置，从查找表中提取数据并存储为字典格式
+        根据config中的配置，从各数据源中提取数据并存储为字典格式；
+        每个数据源单独使用磁盘缓存，未命中的数据源并发读取：
+        同一Excel文件只打开一次，同一Sheet的所有范围一次扫描读出。
+        同一字段有多个数据源时按配置顺序合并，排在前面的数据源优先；
+        前面数据源中值为空的键由后面数据源补充
+        """
+        sources = {}  # (文件绝对路径, 缓存键) -> 数据源，相同数据源只读取一次
+        for mapping in self.mappings.values():
+            for source in mapping.sources:
+                sources.setdefault((os.path.abspath(source.path), source.cache_key), source)
+
+        index_cache = LookupIndexCache(self.cache_path) if self.cache != "bypass" else None
+
+        try:
+            loaded = {}  # (文件绝对路径, 缓存键) -> 查找字典
+            if self.cache == "use":
+                for source_id, source in sources.items():
+                    source_dict = index_cache.get(source.path, source.cache_key)
+                    if source_dict is not None:
+                        loaded[source_id] = source_dict
+
+            pending = {k: v for k, v in sources.items() if k not in loaded}
+            read = self._read_sources(pending)
+            loaded.update(read)
+            if index_cache is not None:
+                for source_id, source_dict in read.items():
+                    index_cache.put(pending[source_id].path, pending[source_id].cache_key, source_dict)
+        finally:
+            if index_cache is not None:
+                index_cache.close()
+
+        for field, mapping in self.mappings.items():
+            source_ids = [(os.path.abspath(s.path), s.cache_key) for s in mapping.sources]
+            if len(source_ids) == 1:
+                self.lookup_data[field] = loaded[source_ids[0]]  # 存储字段对应的查找字典
+                continue
+            field_dict = {}
+            for source_id in source_ids:
+                for key, value in loaded[source_id].items():
+                    if field_dict.get(key) is None:
+                        field_dict[key] = value
+            self.lookup_data[field] = field_dict
+
+    def _read_sources(self, sources: dict) -> dict:
+        """
+        并发读取数据源
+
+        :param sources: (文件绝对路径, 缓存键) -> LookupSource
+        :return: (文件绝对路径, 缓存键) -> 查找字典
+        """
+        workbooks = {}  # 文件 -> Sheet名(None为活动Sheet) -> {数据源ID: 数据源}
+        tables = {}  # 数据源ID -> CSV/Parquet数据源
+        for source_id, source in sources.items():
+            if source.kind == "excel":
+                sheets = workbooks.setdefault(source_id[0], {})
+                sheets.setdefault(source.sheet, {})[source_id] = source
+            else:
+                tables[source_id] = source
+
+        task_count = len(workbooks) + len(tables)
+        if not task_count:
+            return {}
+
+        result = {}
+        with ThreadPoolExecutor(max_workers=min(task_count, os.cpu_count() or 1)) as executor:
+            workbook_futures = [
+                executor.submit(self._read_workbook_ranges, path, sheets)
+                for path, sheets in workbooks.items()
+            ]
+            table_futures = {
+                source_id: executor.submit(source.read_table)
+                for source_id, source in tables.items()
+            }
+            for future in workbook_futures:
+                result.update(future.result())
+            for source_id, future in table_futures.items():
+                result[source_id] = future.result()
+        return result
+
+    @classmethod
+    def _read_workbook_ranges(cls, path: str, sheets: dict) -> dict:
+        """
+        打开一次Excel文件，按Sheet读取所有范围
+
+        :param sheets: Sheet名(None为活动Sheet) -> {数据源ID: 数据源}
+        :return: 数据源ID -> 查找字典
         """
         # 以只读模式加载查找表（提高大文件读取性能）
-        lookup_wb = openpyxl.load_workbook(
-            self.lookup_path, read_only=True, data_only=True
+        lookup_wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            result = {}
+            for sheet_name, ranges in sheets.items():
+                lookup_sheet = lookup_wb[sheet_name] if sheet_name else lookup_wb.active
+                result.update(cls._read_lookup_ranges(lookup_sheet, ranges))
+            return result
+        finally:
+            lookup_wb.close()  # 关闭查找表工作簿
+
+    @staticmethod
+    def _read_lookup_ranges(lookup_sheet: Worksheet, ranges: dict) -> dict:
+        """
+        一次扫描读取多个数据源的查找范围
+
+        按所有范围的行列并集流式读取查找表，每行同时填充各数据源的字典；
+        每个范围取前key_width列作为键、随后value_width列作为值，保留键第一次出现的值
+
+        :param lookup_sheet: 查找表工作表
+        :param ranges: 数据源ID -> Excel数据源（范围如"A2:B2853"、"AA2:AB900"）
+        :return: 数据源ID -> 查找字典
+        """
+        bounds = {
+            source_id: parse_range(source.range_str) for source_id, source in ranges.items()
+        }
+        min_col = min(b[0] for b in bounds.values())
+        min_row = min(b[1] for b in bounds.values())
+        max_col = max(
+            max(b[2], b[0] + source.key_width + source.value_width - 1)
+            for b, source in zip(bounds.values(), ranges.values())
         )
+        max_row = max(b[3] for b in bounds.values())
 
-        for field, range_str in self.config.items():
-            # 解析范围字符串（如"A2:B2853"）
-            start_end = range_str.split(":")
-            start_col = column_index_from_string(start_end[0][0])  # 起始列字母转数字
-            start_row = int(start_end[0][1:])  # 起始行号
-            end_col = column_index_from_string(start_end[1][0])  # 结束列字母转数字
-            end_row = int(start_end[1][1:])  # 结束行号
+        # (字典, 取键函数, 取值函数, 多列值, 起始行, 结束行)
+        specs = [
+            (
+                {},
+                *source.getters(start_col - min_col),
+                source.value_width > 1,
+                start_row,
+                end_row,
+            )
+            for (start_col, start_row, _, end_row), source in zip(bounds.values(), ranges.values())
+        ]
 
-            # 读取数据并保持首次出现的键值（去重）
-            lookup_sheet = lookup_wb.active  # 默认使用活动工作表
-            field_dict = {}
-            for row in lookup_sheet.iter_rows(
-                min_row=start_row,
-                max_row=end_row,
-                min_col=start_col,
-                max_col=end_col,
+        for row_idx, row in enumerate(
+            lookup_sheet.iter_rows(
+                min_row=min_row,
+                max_row=max_row,
+                min_col=min_col,
+                max_col=max_col,
                 values_only=True,  # 只获取值，不保留单元格对象
-            ):
-                key, value = row[0], row[1]  # 假设每行两列：键和值
-                if key not in field_dict:  # 只保留第一次出现的键值
-                    field_dict[key] = value
+            ),
+            start=min_row,
+        ):
+            for field_dict, key_of, value_of, multi_value, start_row, end_row in specs:
+                if start_row <= row_idx <= end_row:
+                    key = key_of(row)
+                    if key not in field_dict:  # 只保留第一次出现的键值
+                        value = value_of(row)
+                        if multi_value and all(v is None for v in value):
+                            value = None
+                        field_dict[key] = value
 
-            self.lookup_data[field] = field_dict  # 存储字段对应的查找字典
-        lookup_wb.close()  # 关闭查找表工作簿
+        return {field: spec[0] for field, spec in zip(bounds, specs)}
 
     def _process_target_file(self) -> None:
         """
@@ -182,52 +1030,497 @@ class Smap:
                 continue  # 跳过不存在的Sheet
 
             sheet = self.target_wb[sheet_name]
-            for field in self.config.keys():
-                # 查找目标列位置
-                target_col = self._find_target_column(sheet, field)
-                if target_col is None:
-                    continue  # 跳过不存在的字段
+            # 一次解析表头，得到所有字段的列位置（列不全的字段被跳过）
+            header = [cell.value for cell in sheet[self.header_row]]
+            for field, (match_cols, write_cols) in self._resolve_target_columns(header).items():
+                # 处理该字段的数据
+                self._process_column(sheet, field, match_cols, write_cols)
 
-                # 处理该列数据
-                self._process_column(sheet, field, target_col)
+    def _process_target_streaming(self) -> str:
+        """
+        流式处理目标文件
 
-    def _find_target_column(self, sheet: Worksheet, field: str) -> int:
+        以只读模式逐行读取目标工作簿，每行一次性替换所有映射列后写入只写模式的新工作簿，
+        内存占用取决于查找表大小而非目标文件大小；只写模式只保留单元格值，不保留样式
+
+        :return: 新文件的保存路径
         """
-        在目标工作表中查找指定字段的列号
+        new_path = self._output_path()
+        manifest = changed = None
+        if self.incremental:
+            manifest = RowManifest(new_path)
+            settings = self._manifest_settings()
+            lookup_digests = {
+                field: (
+                    RowManifest.key_digests(lookup_map),
+                    RowManifest.key_digests(self._normalized_map(field))
+                    if self.key_normalizer is not None
+                    else None,
+                )
+                for field, lookup_map in self.lookup_data.items()
+            }
+            if manifest.usable(settings):
+                changed = manifest.changed_keys(lookup_digests)
+                previous = manifest.previous
+                if (
+                    not changed
+                    and previous["target"] == RowManifest.file_stamp(self.target_path)
+                    and previous["output"] == RowManifest.file_stamp(new_path)
+                ):
+                    # 目标文件和查找索引都没有变化，直接沿用上次的输出和匹配统计
+                    for field, stats in manifest.previous_stats():
+                        self._count_rows(field, sum(stats.values()), stats["hit"], stats["blank"])
+                    self.incremental_stats["reused"] += sum(
+                        len(rows) for _, rows in previous["sheets"].values()
+                    )
+                    return new_path
 
-        :param sheet: 目标工作表对象
-        :param field: 要查找的字段名
-        :return: 列号（1-based），未找到返回None
+        source_wb = openpyxl.load_workbook(self.target_path, read_only=True)
+        output_wb = openpyxl.Workbook(write_only=True)
+        # 计算数据起始行（表头行 + 跳过的行数 + 1）
+        start_row = self.header_row + self.skip_rows + 1
+
+        try:
+            for sheet in source_wb.worksheets:
+                output_sheet = output_wb.create_sheet(sheet.title)
+                rows = sheet.iter_rows(values_only=True)
+                if self.sheet_names and sheet.title not in self.sheet_names:
+                    for row in rows:
+                        output_sheet.append(row)
+                    continue
+
+                columns = self._streaming_columns(sheet)
+                if manifest is not None and columns:
+                    previous_sheet = (
+                        manifest.previous["sheets"].get(sheet.title) if changed is not None else None
+                    )
+                    manifest.sheets[sheet.title] = self._stream_rows_incremental(
+                        output_sheet, rows, columns, start_row, previous_sheet, changed
+                    )
+                    continue
+
+                chunk = []
+                for row_idx, row in enumerate(rows, start=1):
+                    if row_idx < start_row or not columns:
+                        output_sheet.append(row)
+                        continue
+                    chunk.append(list(row))
+                    if len(chunk) >= STREAMING_CHUNK_ROWS:
+                        self._write_chunk(output_sheet, chunk, columns)
+                        chunk = []
+                self._write_chunk(output_sheet, chunk, columns)
+
+            output_wb.save(new_path)
+        finally:
+            source_wb.close()
+        if manifest is not None:
+            manifest.save(settings, self.target_path, new_path, lookup_digests)
+        return new_path
+
+    def _manifest_settings(self) -> str:
+        """影响输出结果的处理设置，任一项变化时增量清单失效"""
+        handler = self.match_handler
+        return json.dumps(
+            {
+                "config": self.config,
+                "header_row": self.header_row,
+                "skip_rows": self.skip_rows,
+                "sheet_names": self.sheet_names,
+                "handler": [
+                    type(handler).__module__,
+                    type(handler).__qualname__,
+                    sorted(getattr(handler, "__dict__", {}).items()),
+                ],
+                "normalize": sorted(self.key_normalizer.rules) if self.key_normalizer else None,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+            default=repr,
+        )
+
+    def _stream_rows_incremental(
+        self,
+        output_sheet: Worksheet,
+        rows,
+        columns: list,
+        start_row: int,
+        previous: tuple | None,
+        changed: dict | None,
+    ) -> tuple:
+        """
+        增量模式下流式处理一个Sheet
+
+        指纹与上次相同、且各字段的键对应的查找项（含归一化后的键）都没有变化的行，
+        直接沿用上次的输出值和匹配结果，其余行重新计算
+
+        :param rows: 从第1行开始的行值迭代器
+        :param columns: 见_streaming_columns
+        :param start_row: 数据起始行
+        :param previous: 上次运行该Sheet的清单（见RowManifest.sheets），None表示没有可沿用的行
+        :param changed: 查找字典有变化的键摘要，见RowManifest.changed_keys
+        :return: 本次运行该Sheet的清单
+        """
+        fields = tuple(field for field, _, _ in columns)
+        watched = sorted({i for _, match_idx, write_idx in columns for i in match_idx + write_idx})
+        write_cols = sorted({i for _, _, write_idx in columns for i in write_idx})
+        width = watched[-1] + 1
+
+        previous_rows = None
+        if previous is not None and previous[0] == fields:
+            previous_rows = previous[1]
+        # 查找字典有变化的字段：(取键函数, 有变化的键摘要, 有变化的归一化键摘要)
+        changed_lookups = [
+            (itemgetter(*match_idx), *changed[field])
+            for field, match_idx, _ in columns
+            if changed and field in changed
+        ]
+
+        def lookup_changed(values: list) -> bool:
+            for key_of, keys, normalized_keys in changed_lookups:
+                key = key_of(values)
+                if keys and RowManifest.key_digest(key) in keys:
+                    return True
+                if normalized_keys and (
+                    RowManifest.key_digest(self.key_normalizer(key)) in normalized_keys
+                ):
+                    return True
+            return False
+
+        result = {}
+
+        def flush(chunk: list) -> None:
+            fingerprints, recompute, recompute_rows, reused_codes = [], [], [], []
+            for row_idx, values in chunk:
+                fingerprint = RowManifest.fingerprint([values[i] for i in watched])
+                fingerprints.append(fingerprint)
+                entry = previous_rows.get(row_idx) if previous_rows is not None else None
+                if entry is None or entry[0] != fingerprint or lookup_changed(values):
+                    recompute.append(values)
+                    recompute_rows.append(row_idx)
+                    continue
+                for col_idx, value in zip(write_cols, entry[1]):
+                    values[col_idx] = value
+                reused_codes.append(entry[2])
+
+            outcomes = {field: [RowManifest.HIT] * len(recompute) for field in fields}
+            self._transform_chunk(recompute, columns, outcomes)
+            # 沿用的行计入上次的匹配结果，统计与全部重新计算时一致
+            for field, stats in RowManifest.count_outcomes(fields, reused_codes):
+                self._count_rows(field, sum(stats.values()), stats["hit"], stats["blank"])
+            self.incremental_stats["recomputed"] += len(recompute)
+            self.incremental_stats["reused"] += len(reused_codes)
+
+            codes = {
+                row_idx: bytes(outcomes[field][position] for field in fields)
+                for position, row_idx in enumerate(recompute_rows)
+            }
+            for (row_idx, values), fingerprint in zip(chunk, fingerprints):
+                row_codes = codes.get(row_idx)
+                if row_codes is None:
+                    row_codes = previous_rows[row_idx][2]
+                result[row_idx] = (fingerprint, tuple(values[i] for i in write_cols), row_codes)
+                output_sheet.append(values)
+
+        chunk = []
+        for row_idx, row in enumerate(rows, start=1):
+            if row_idx < start_row:
+                output_sheet.append(row)
+                continue
+            values = list(row)
+            if len(values) < width:
+                values.extend([None] * (width - len(values)))
+            chunk.append((row_idx, values))
+            if len(chunk) >= STREAMING_CHUNK_ROWS:
+                flush(chunk)
+                chunk = []
+        flush(chunk)
+        return fields, result
+
+    def _streaming_columns(self, sheet: Worksheet) -> list:
+        """
+        开始流式处理前一次解析表头
+
+        :return: [(字段名, 键列下标列表, 写入列下标列表), ...]，下标从0开始
+        """
+        header = next(
+            sheet.iter_rows(min_row=self.header_row, max_row=self.header_row, values_only=True),
+            (),
+        )
+        return [
+            (field, [c - 1 for c in match_cols], [c - 1 for c in write_cols])
+            for field, (match_cols, write_cols) in self._resolve_target_columns(header).items()
+        ]
+
+    def _write_chunk(self, output_sheet: Worksheet, chunk: list, columns: list) -> None:
+        """
+        按字段替换一批行中所有映射列的值并写出
+
+        :param output_sheet: 只写模式的输出工作表
+        :param chunk: 行值列表的列表（会被修改）
+        :param columns: 见_streaming_columns
+        """
+        self._transform_chunk(chunk, columns)
+        for values in chunk:
+            output_sheet.append(values)
+
+    def _transform_chunk(self, chunk: list, columns: list, outcomes: dict = None) -> None:
+        """
+        按字段替换一批行中所有映射列的值（原地修改chunk）
+
+        :param chunk: 行值列表的列表
+        :param columns: 见_streaming_columns
+        :param outcomes: 字段 -> 与chunk等长的列表，传入时写入每行的匹配结果代码（见RowManifest）
+        """
+        for field, match_idx, write_idx in columns:
+            width = max(*match_idx, *write_idx) + 1
+            for values in chunk:
+                if width > len(values):
+                    values.extend([None] * (width - len(values)))
+            key_of = itemgetter(*match_idx)  # 复合键时返回元组
+            keys = [key_of(values) for values in chunk]
+            currents = [[values[col_idx] for values in chunk] for col_idx in write_idx]
+            mapped = self._map_values(
+                field, keys, currents, outcomes[field] if outcomes is not None else None
+            )
+            for col_idx, column in zip(write_idx, mapped):
+                for values, value in zip(chunk, column):
+                    values[col_idx] = value
+
+    def _map_values(
+        self, field: str, keys: list, currents: list, outcomes: list = None
+    ) -> list:
+        """
+        对一批行执行查找替换，返回各写入列替换后的值
+
+        :param field: 字段名
+        :param keys: 每行的查找键（复合键为元组）
+        :param currents: 每个写入列的原始值列表
+        :param outcomes: 与keys等长的列表，传入时写入每行的匹配结果代码（见RowManifest）
+        :return: 每个写入列替换后的值列表
+        """
+        if self.engine == "pandas":
+            return self._map_values_pandas(field, keys, currents, outcomes)
+
+        lookup_map: dict = self.lookup_data.get(field, {})
+        width = len(currents)
+        missing = (None,) * width
+        result = [[] for _ in range(width)]
+        hits = blanks = 0
+        for row_idx, key in enumerate(keys):
+            # 查找匹配值
+            lookup_value = lookup_map.get(key)
+            if lookup_value is None and self.key_normalizer is not None:
+                lookup_value = self._lookup_normalized(field, key)
+            if lookup_value is not None:
+                hits += 1
+                outcome = RowManifest.HIT
+            elif _is_blank_key(key):
+                blanks += 1
+                outcome = RowManifest.BLANK
+            else:
+                outcome = RowManifest.MISS
+            if outcomes is not None:
+                outcomes[row_idx] = outcome
+            if width == 1:
+                lookup_value = (lookup_value,)
+            elif lookup_value is None:
+                lookup_value = missing
+            for column, current, value in zip(result, currents, lookup_value):
+                cell = _ValueCell(current[row_idx])
+                if value is not None:
+                    self.match_handler.on_match(cell, value)  # 匹配成功处理
+                else:
+                    self.match_handler.on_no_match(cell)  # 匹配失败处理
+                column.append(cell.value)
+        self._count_rows(field, len(keys), hits, blanks)
+        return result
+
+    def _map_values_pandas(
+        self, field: str, keys: list, currents: list, outcomes: list = None
+    ) -> list:
         """
-        for cell in sheet[self.header_row]:  # 在表头行中查找
-            if cell.value == field:
-                return cell.column
-        return None
+        列式哈希连接：一次 get_indexer 得到所有行在查找表中的位置
 
-    def _process_column(self, sheet: Worksheet, field: str, target_col: int) -> None:
+        语义与 EmptyOrKeep 一致：查找值为None视为未匹配，按策略置空或保留原值
         """
-        处理单个列的数据替换
+        import numpy as np
+        import pandas as pd
+
+        width = len(currents)
+        if field not in self._pandas_index:
+            lookup_map: dict = self.lookup_data.get(field, {})
+            # 对象类型索引按 Python 相等性比较（1 == 1.0），与字典查找一致；复合键按元组整体比较
+            index = pd.Index(list(lookup_map.keys()), dtype=object, tupleize_cols=False)
+            lookup_values = np.empty(len(lookup_map) + 1, dtype=object)  # 末位None对应未找到(-1)
+            if width == 1:
+                lookup_values[:-1] = list(lookup_map.values())
+                columns = [lookup_values]
+            else:
+                for position, value in enumerate(lookup_map.values()):
+                    lookup_values[position] = value  # 逐个赋值，避免元组被numpy展开
+                columns = []
+                for col_idx in range(width):
+                    column = np.empty(len(lookup_values), dtype=object)
+                    column[:] = [None if v is None else v[col_idx] for v in lookup_values]
+                    columns.append(column)
+            self._pandas_index[field] = (index, lookup_values, columns)
+        index, lookup_values, columns = self._pandas_index[field]
+
+        key_array = np.empty(len(keys), dtype=object)
+        for row_idx, key in enumerate(keys):  # 逐个赋值，避免元组被numpy展开
+            key_array[row_idx] = key
+        positions = index.get_indexer(pd.Index(key_array, dtype=object, tupleize_cols=False))
+        mapped = [column[positions] for column in columns]
+        not_found = np.flatnonzero(np.equal(lookup_values[positions], None))
+        hits, blanks = len(keys) - len(not_found), 0
+        if outcomes is not None:
+            outcomes[:] = [RowManifest.HIT] * len(keys)
+        for row_idx in not_found:
+            if self.key_normalizer is not None:
+                # 精确匹配失败的行再按归一化键查找
+                lookup_value = self._lookup_normalized(field, key_array[row_idx])
+                if lookup_value is not None:
+                    for column, value in zip(
+                        mapped, (lookup_value,) if width == 1 else lookup_value
+                    ):
+                        column[row_idx] = value
+                    hits += 1
+                    continue
+            blank = _is_blank_key(key_array[row_idx])
+            blanks += blank
+            if outcomes is not None:
+                outcomes[row_idx] = RowManifest.BLANK if blank else RowManifest.MISS
+        self._count_rows(field, len(keys), hits, blanks)
+
+        result = []
+        for column, current in zip(mapped, currents):
+            if self.match_handler.not_found_action == "keep":
+                missing = np.equal(column, None)
+                original = np.empty(len(current), dtype=object)
+                original[:] = current
+                column[missing] = original[missing]
+            result.append(column.tolist())
+        return result
+
+    def _count_rows(self, field: str, rows: int, hits: int, blanks: int) -> None:
+        """累计字段的匹配统计：hit匹配、blank键为空且未匹配、miss其余未匹配"""
+        stats = self.field_stats.setdefault(field, Counter(hit=0, miss=0, blank=0))
+        stats["hit"] += hits
+        stats["blank"] += blanks
+        stats["miss"] += rows - hits - blanks
+
+    def _lookup_normalized(self, field: str, value):
+        """
+        按归一化后的键查找（精确匹配失败时调用），命中时计入normalized_hits
+
+        归一化查找字典在字段第一次使用时构建，多个原始键归一化后相同时保留第一个
+        """
+        lookup_value = self._normalized_map(field).get(self.key_normalizer(value))
+        if lookup_value is not None:
+            self.normalized_hits[field] += 1
+        return lookup_value
+
+    def _normalized_map(self, field: str) -> dict:
+        """字段的归一化查找字典，第一次使用时构建；多个原始键归一化后相同时保留第一个"""
+        normalized_map = self._normalized_index.get(field)
+        if normalized_map is None:
+            normalized_map = {}
+            for key, lookup_value in self.lookup_data.get(field, {}).items():
+                normalized_map.setdefault(self.key_normalizer(key), lookup_value)
+            self._normalized_index[field] = normalized_map
+        return normalized_map
+
+    def _resolve_target_columns(self, header: tuple | list) -> dict:
+        """
+        在表头行中查找所有配置字段的键列和写入列
+
+        :param header: 表头行的值
+        :return: 字段 -> (键列号列表, 写入列号列表)，列号从1开始；列不全的字段不包含在内
+        """
+        positions = {}
+        for col_idx, value in enumerate(header, start=1):
+            if value not in positions:  # 同名列取第一个
+                positions[value] = col_idx
+        return {
+            field: (
+                [positions[name] for name in mapping.match],
+                [positions[name] for name in mapping.write],
+            )
+            for field, mapping in self.mappings.items()
+            if all(name in positions for name in mapping.match + mapping.write)
+        }
+
+    def _process_column(
+        self, sheet: Worksheet, field: str, match_cols: list, write_cols: list
+    ) -> None:
+        """
+        处理单个字段的数据替换
 
         :param sheet: 目标工作表对象
         :param field: 当前处理的字段名
-        :param target_col: 目标列号（1-based）
+        :param match_cols: 键列号列表（1-based），多列时组成复合键
+        :param write_cols: 写入列号列表（1-based）
         """
         # 计算数据起始行（表头行 + 跳过的行数 + 1）
         start_row = self.header_row + self.skip_rows + 1
+        # 只遍历涉及的列范围，每行的键和写入单元格按偏移取出
+        min_col = min(*match_cols, *write_cols)
+        max_col = max(*match_cols, *write_cols)
+        key_of = itemgetter(*(c - min_col for c in match_cols))
+        write_offsets = [c - min_col for c in write_cols]
+        composite = len(match_cols) > 1
+        rows = sheet.iter_rows(min_row=start_row, min_col=min_col, max_col=max_col)
+
+        if self.engine == "pandas":
+            rows = list(rows)
+            keys = [
+                tuple(cell.value for cell in key_of(row)) if composite else key_of(row).value
+                for row in rows
+            ]
+            cells = [[row[offset] for row in rows] for offset in write_offsets]
+            mapped = self._map_values(field, keys, [[c.value for c in col] for col in cells])
+            for column_cells, column in zip(cells, mapped):
+                for cell, value in zip(column_cells, column):
+                    cell.value = value
+            return
+
         # 获取该字段对应的查找字典
         lookup_map: dict = self.lookup_data.get(field, {})
+        width = len(write_cols)
+        missing = (None,) * width
 
-        # 遍历目标列的所有单元格
-        for row in sheet.iter_rows(
-            min_row=start_row, min_col=target_col, max_col=target_col
-        ):
-            cell = row[0]
+        row_count = hits = blanks = 0
+
+        # 遍历目标行，每行只构造一次键
+        for row in rows:
+            row_count += 1
+            key = tuple(cell.value for cell in key_of(row)) if composite else key_of(row).value
             # 查找匹配值
-            lookup_value = lookup_map.get(cell.value)
+            lookup_value = lookup_map.get(key)
+            if lookup_value is None and self.key_normalizer is not None:
+                lookup_value = self._lookup_normalized(field, key)
             if lookup_value is not None:
-                self.match_handler.on_match(cell, lookup_value)  # 匹配成功处理
-            else:
-                self.match_handler.on_no_match(cell)  # 匹配失败处理
+                hits += 1
+            elif _is_blank_key(key):
+                blanks += 1
+            if width == 1:
+                lookup_value = (lookup_value,)
+            elif lookup_value is None:
+                lookup_value = missing
+            for offset, value in zip(write_offsets, lookup_value):
+                cell = row[offset]
+                if value is not None:
+                    self.match_handler.on_match(cell, value)  # 匹配成功处理
+                else:
+                    self.match_handler.on_no_match(cell)  # 匹配失败处理
+        self._count_rows(field, row_count, hits, blanks)
+
+    def _output_path(self) -> str:
+        """构造新文件名（原文件名 + 后缀）"""
+        original_dir = os.path.dirname(self.target_path)
+        original_name = os.path.basename(self.target_path)
+        base_name, ext = os.path.splitext(original_name)
+        return os.path.join(original_dir, f"{base_name}{self.suffix}{ext}")
 
     def _save_processed_file(self) -> str:
         """
@@ -235,11 +1528,7 @@ class Smap:
 
         :return: 新文件的保存路径
         """
-        # 构造新文件名（原文件名 + 后缀）
-        original_dir = os.path.dirname(self.target_path)
-        original_name = os.path.basename(self.target_path)
-        base_name, ext = os.path.splitext(original_name)
-        new_path = os.path.join(original_dir, f"{base_name}{self.suffix}{ext}")
+        new_path = self._output_path()
 
         # 保存并关闭工作簿
         self.target_wb.save(new_path)
@@ -256,6 +1545,12 @@ def smap(
     sheet_names: list = None,
     suffix: str = "_processed",
     not_math: str = "empty",
+    cache: str = "bypass",
+    cache_path: str = None,
+    mode: str = "full",
+    engine: str = "python",
+    normalize: list | tuple = None,
+    incremental: bool = False,
 ) -> str:
     """
     快捷函数：创建Smap实例并执行处理
@@ -268,6 +1563,12 @@ def smap(
     :param sheet_names: 指定处理的Sheet列表
     :param suffix: 输出文件后缀
     :param not_math: 未匹配时的处理方式（"empty"或"keep"）
+    :param cache: 查找表索引缓存策略（"bypass"默认不使用、"use"或"rebuild"）
+    :param cache_path: 缓存数据库路径
+    :param mode: 处理模式（"full"或"streaming"）
+    :param engine: 查找替换引擎（"python"或"pandas"）
+    :param normalize: 键归一化规则列表（见KeyNormalizer.RULES）
+    :param incremental: 增量处理（仅流式模式）
     :return: 处理后的文件路径
     """
     smap = Smap(
@@ -279,18 +1580,172 @@ def smap(
         sheet_names=sheet_names,
         suffix=suffix,
         match_handler=EmptyOrKeep(not_math),
+        cache=cache,
+        cache_path=cache_path,
+        mode=mode,
+        engine=engine,
+        normalize=normalize,
+        incremental=incremental,
     )
     return smap.process()
 
 
+# 工作进程共享的查找表索引（fork 时由主进程写入，spawn 时由初始化函数写入）
+_WORKER_LOOKUP_DATA = None
+
+
+def _init_worker(lookup_data: dict | None) -> None:
+    global _WORKER_LOOKUP_DATA
+    if lookup_data is not None:
+        _WORKER_LOOKUP_DATA = lookup_data
+
+
+def _process_in_worker(options: dict) -> str:
+    processor = Smap(**options)
+    processor.lookup_data = _WORKER_LOOKUP_DATA
+    return processor.process()
+
+
+def smap_parallel(
+    target_paths: list,
+    lookup_path: str,
+    config: dict = None,
+    header_row: int = 2,
+    skip_rows: int = 0,
+    sheet_names: list = None,
+    suffix: str = "_processed",
+    not_math: str = "empty",
+    cache: str = "bypass",
+    cache_path: str = None,
+    mode: str = "full",
+    engine: str = "python",
+    normalize: list | tuple = None,
+    incremental: bool = False,
+    max_workers: int = None,
+) -> list:
+    """
+    并行处理多个目标文件
+
+    查找表只在主进程加载一次：支持 fork 的平台由子进程写时复制共享，
+    否则（Windows）在每个工作进程初始化时传入一次，不随每个任务重复序列化。
+    每个文件的所有Sheet在同一个工作进程中处理（xlsx 只能由一个写入者整体保存）。
+
+    :param target_paths: 目标文件路径列表
+    :param max_workers: 最大进程数，None表示CPU核数
+    :return: 处理后的文件路径列表，与target_paths顺序一致
+    其余参数同smap()
+    """
+    global _WORKER_LOOKUP_DATA
+
+    if len(set(map(os.path.abspath, target_paths))) != len(target_paths):
+        raise ValueError("目标文件列表中存在重复路径")
+
+    options = [
+        dict(
+            target_path=target_path,
+            lookup_path=lookup_path,
+            config=config,
+            header_row=header_row,
+            skip_rows=skip_rows,
+            sheet_names=sheet_names,
+            suffix=suffix,
+            match_handler=EmptyOrKeep(not_math),
+            mode=mode,
+            engine=engine,
+            normalize=normalize,
+            incremental=incremental,
+        )
+        for target_path in target_paths
+    ]
+    if not options:
+        return []
+
+    loader = Smap(**options[0], cache=cache, cache_path=cache_path)
+    loader._load_lookup_data()
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        _WORKER_LOOKUP_DATA = loader.lookup_data
+        initargs = (None,)
+    else:
+        context = multiprocessing.get_context("spawn")
+        initargs = (loader.lookup_data,)
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=initargs,
+        ) as executor:
+            return list(executor.map(_process_in_worker, options))
+    finally:
+        _WORKER_LOOKUP_DATA = None
+
+
 # 使用示例
 if __name__ == "__main__":
-    # 示例调用
-    result_path = smap(
-        target_path="src/test/smap/维护BOM信息all250427.xlsx",
-        lookup_path="src/test/smap/昆山1对照表_no_duplicates.xlsx",
-        header_row=2,
-        config='{"元件品号": "A2:B2853"}',
+    p = argparse.ArgumentParser()
+    p.add_argument("--target", required=True, help="待处理Excel文件路径")
+    p.add_argument("--lookup", help="查找表Excel文件路径（配置中的数据源都指定了path时可省略）")
+    p.add_argument("--config", required=True, help='字段映射配置JSON，如 {"元件品号": "A2:B2853"}，复合键/多列返回见FieldMapping')
+    p.add_argument("--header-row", default=2, type=int, help="表头行号")
+    p.add_argument("--skip-rows", default=0, type=int, help="表头后跳过的行数")
+    p.add_argument("--sheets", nargs="*", help="指定处理的Sheet名称")
+    p.add_argument("--suffix", default="_processed", help="输出文件后缀")
+    p.add_argument("--not-match", default="empty", choices=["empty", "keep"], help="未匹配时的处理方式")
+    p.add_argument("--streaming", action="store_true", help="流式逐行读写目标文件（仅保留值）")
+    p.add_argument("--engine", default="python", choices=["python", "pandas"], help="查找替换引擎")
+    p.add_argument(
+        "--normalize",
+        nargs="*",
+        choices=KeyNormalizer.RULES,
+        help="精确匹配失败时按归一化后的键查找，不带规则名表示启用全部规则",
+    )
+    p.add_argument("--incremental", action="store_true", help="增量处理：只重新计算有变化的行（需--streaming）")
+    p.add_argument("--dry-run", action="store_true", help="试运行：只统计变更，不修改也不保存目标文件")
+    p.add_argument("--changes", help="试运行时导出变更集的路径（.csv或.jsonl）")
+    p.add_argument("--cache-path", help="查找表索引缓存路径")
+    cache_group = p.add_mutually_exclusive_group()
+    cache_group.add_argument("--cache", action="store_true", help="使用查找表索引缓存")
+    cache_group.add_argument("--rebuild-cache", action="store_true", help="重建查找表索引缓存")
+    args = p.parse_args()
+
+    processor = Smap(
+        target_path=args.target,
+        lookup_path=args.lookup,
+        config=args.config,
+        header_row=args.header_row,
+        skip_rows=args.skip_rows,
+        sheet_names=args.sheets,
+        suffix=args.suffix,
+        match_handler=EmptyOrKeep(args.not_match),
+        cache="use" if args.cache else "rebuild" if args.rebuild_cache else "bypass",
+        cache_path=args.cache_path,
+        mode="streaming" if args.streaming else "full",
+        engine=args.engine,
+        normalize=KeyNormalizer.RULES if args.normalize == [] else args.normalize,
+        incremental=args.incremental,
     )
+    if args.dry_run:
+        change_set = processor.preview()
+        print(f"试运行完成，共{len(change_set.changes)}个单元格将被修改")
+        if args.changes:
+            print(f"变更集已保存至：{change_set.save(args.changes)}")
+    else:
+        result_path = processor.process()
+        print(f"处理完成，文件已保存至：{result_path}")
+        if args.incremental:
+            stats = processor.incremental_stats
+            print(f"  增量处理：沿用{stats['reused']}行，重新计算{stats['recomputed']}行")
+    for field, stats in processor.field_stats.items():
+        print(f"  {field}: 匹配{stats['hit']}行，未匹配{stats['miss']}行，键为空{stats['blank']}行")
+    for field, hits in processor.normalized_hits.items():
+        print(f"  {field}: {hits}行经键归一化后匹配")
 
-    print(f"处理完成，文件已保存至：{result_path}")
+"""
+python src/scripts/smap.py `
+--target "src/test/smap/维护BOM信息all250427.xlsx" `
+--lookup "src/test/smap/昆山1对照表_no_duplicates.xlsx" `
+--config '{\"元件品号\": \"A2:B2853\"}'
+"""
@@ -1,7 +1,11 @@
-import openpyxl
+from openpyxl.styles import PatternFill
 from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.cell import Cell
 
+# 共用的填充样式，避免每次匹配都创建新对象
+MATCH_FILL = PatternFill(start_color="00FF00", fill_type="solid")
+NOMATCH_FILL = PatternFill(start_color="FF0000", fill_type="solid")
+
 
 class CopyCloumnHandler:
     def __init__(self, max_num: int):
@@ -20,12 +24,8 @@ class CopyCloumnHandler:
         """
         self.matches.append(f"{cell1.value}")
         # 将匹配的单元格标为绿色
-        cell1.fill = openpyxl.styles.PatternFill(
-            start_color="00FF00", fill_type="solid"
-        )
-        cell2.fill = openpyxl.styles.PatternFill(
-            start_color="00FF00", fill_type="solid"
-        )
+        cell1.fill = MATCH_FILL
+        cell2.fill = MATCH_FILL
 
         # 获取参照表cell所在的列
         ref_col = cell2.column
@@ -33,25 +33,33 @@ class CopyCloumnHandler:
         # 获取遍历表cell所在的列
         target_col = cell1.column
 
-        # 获取参照表的数据范围（从匹配行+1开始，共max_num行）
-        start_row = cell2.row + 1
-        end_row = start_row + self.max_num - 1
+        # 从匹配行+1开始最多复制max_num行，只处理到两个表实际的数据范围为止：
+        # 参照表数据范围内的值被复制，遍历表原有数据范围内多出的行被清空
+        source_count = max(0, min(self.max_num, sheet2.max_row - cell2.row))
+        target_count = max(0, min(self.max_num, sheet1.max_row - cell1.row))
 
-        # 从参照表复制数据到遍历表
-        for row_idx, row in enumerate(range(start_row, end_row + 1), start=1):
-            # 获取参照表单元格的值
-            ref_cell = sheet2.cell(row=row, column=ref_col)
+        # 一次读出参照表的列数据
+        values = [
+            row[0]
+            for row in sheet2.iter_rows(
+                min_row=cell2.row + 1,
+                max_row=cell2.row + source_count,
+                min_col=ref_col,
+                max_col=ref_col,
+                values_only=True,
+            )
+        ]
 
-            # 设置遍历表对应单元格的值（从匹配行+1开始）
-            target_row = cell1.row + row_idx
-            if target_row <= sheet1.max_row:
-                if not ref_cell.value:
-                    sheet1.cell(row=target_row, column=target_col).value = None
-                else:
-                    sheet1.cell(row=target_row, column=target_col, value=ref_cell.value)
-            else:
-                # 如果超出当前行数，则追加新行
-                sheet1.cell(row=target_row, column=target_col, value=ref_cell.value)
+        # 一次写入遍历表的列数据
+        for offset in range(max(source_count, target_count)):
+            value = values[offset] if offset < source_count else None
+            target_row = cell1.row + offset + 1
+            if offset < target_count:
+                # 遍历表原有数据范围内，空值（包括0、空字符串）写为None
+                sheet1.cell(row=target_row, column=target_col).value = value or None
+            elif value is not None:
+                # 超出遍历表原有行数时追加新行
+                sheet1.cell(row=target_row, column=target_col, value=value)
 
     def my_on_nomatch(self, cell: Cell, sheet1: Worksheet, sheet2: Worksheet) -> None:
         """
@@ -61,4 +69,4 @@ class CopyCloumnHandler:
         """
         self.not_matches.append(f"{cell.value}")
         # 将不匹配的单元格标为红色
-        cell.fill = openpyxl.styles.PatternFill(start_color="FF0000", fill_type="solid")
+        cell.fill = NOMATCH_FILL
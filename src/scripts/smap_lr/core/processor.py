@@ -3,7 +3,257 @@ from openpyxl.workbook import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.cell import Cell
 from openpyxl.utils.exceptions import InvalidFileException
-from typing import Optional, Dict, List, Callable, Tuple, Any
+from openpyxl.worksheet.copier import WorksheetCopy
+from openpyxl.styles import PatternFill
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.utils import get_column_letter
+from typing import Optional, Dict, List, Callable, Tuple, Any, Iterator, Union, Set
+from collections.abc import MutableMapping
+from copy import copy
+
+
+class BulkWorksheetCopy(WorksheetCopy):
+    """
+    openpyxl工作表复制，单元格直接构造到目标表中
+    不经过 Worksheet.cell 的参数检查和逐个查找，复制内容与 WorksheetCopy 相同
+    """
+
+    def _copy_cells(self) -> None:
+        target = self.target
+        target_cells = target._cells
+        for (row, col), source_cell in self.source._cells.items():
+            style = source_cell._style
+            target_cell = Cell(target, row, col, None, copy(style) if any(style) else None)
+            target_cell._value = source_cell._value
+            target_cell.data_type = source_cell.data_type
+
+            if source_cell.hyperlink:
+                target_cell._hyperlink = copy(source_cell.hyperlink)
+
+            if source_cell.comment:
+                target_cell.comment = copy(source_cell.comment)
+
+            target_cells[(row, col)] = target_cell
+        target._current_row = max(target._current_row, self.source._current_row)
+
+
+class OverlayCell:
+    """
+    叠加模式下Sheet3单元格的临时视图
+    本身不保存任何内容：读取时先查叠加表的补丁，再查Sheet1；写入的值和填充记录到叠加表的补丁中
+    """
+
+    __slots__ = ("sheet", "row", "column")
+
+    def __init__(self, sheet: "OverlaySheet", row: int, column: int) -> None:
+        self.sheet = sheet
+        self.row = row
+        self.column = column
+
+    @property
+    def coordinate(self) -> str:
+        return f"{get_column_letter(self.column)}{self.row}"
+
+    @property
+    def value(self) -> Any:
+        return self.sheet.value(self.row, self.column)
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self.sheet.values.setdefault(self.column, {})[self.row] = value
+
+    @property
+    def fill(self) -> PatternFill:
+        fill_id = self.sheet.fills.get(self.column, {}).get(self.row)
+        if fill_id is not None:
+            return self.sheet.parent._fills[fill_id]
+        source_cell = self.sheet.source._cells.get((self.row, self.column))
+        if source_cell is not None:
+            return source_cell.fill
+        return self.sheet.parent._fills[0]
+
+    @fill.setter
+    def fill(self, value: PatternFill) -> None:
+        # 与直接设置单元格填充一样立即登记到工作簿，保证保存后的样式编号一致
+        self.sheet.fills.setdefault(self.column, {})[self.row] = self.sheet.parent._fills.add(value)
+
+
+class OverlaySheet:
+    """
+    叠加模式下的Sheet3（写时复制）
+    匹配前不复制Sheet1，只按列记录写入的值 {行号: 值} 和填充 {行号: 填充编号}；
+    保存时由Sheet1和这些补丁生成真正的Sheet3（见OverlayWorksheetCopy）。
+    提供匹配处理器用到的 max_row、max_column、cell、iter_rows。
+    与 Worksheet 一样，访问Sheet1中不存在的单元格时会创建空单元格（保存出空行），
+    这些坐标记录在 created 中；Sheet1中已有的单元格只读取，不产生记录
+    """
+
+    def __init__(self, source: Worksheet, title: str) -> None:
+        """
+        :param source: 作为底稿的工作表（Sheet1）
+        :param title: 生成的工作表名称
+        """
+        self.source = source
+        self.title = title
+        self.parent = source.parent
+        self.values: Dict[int, Dict[int, Any]] = {}  # 列号 -> {行号: 值}
+        self.fills: Dict[int, Dict[int, int]] = {}  # 列号 -> {行号: 填充编号}
+        self.created: Dict[int, Set[int]] = {}  # 列号 -> Sheet1中不存在、被访问过的行号
+        self._max_row = source.max_row
+        self._max_column = source.max_column
+
+    @property
+    def max_row(self) -> int:
+        return self._max_row
+
+    @property
+    def max_column(self) -> int:
+        return self._max_column
+
+    def value(self, row: int, column: int) -> Any:
+        """读取单元格的值，不创建单元格"""
+        column_values = self.values.get(column)
+        if column_values is not None and row in column_values:
+            return column_values[row]
+        source_cell = self.source._cells.get((row, column))
+        return None if source_cell is None else source_cell.value
+
+    def _touch(self, row: int, column: int) -> None:
+        """与 Worksheet.cell 一样登记被访问的单元格，Sheet1中已有的不用记录"""
+        if (row, column) not in self.source._cells:
+            self.created.setdefault(column, set()).add(row)
+            if row > self._max_row:
+                self._max_row = row
+            if column > self._max_column:
+                self._max_column = column
+
+    def cell(self, row: int, column: int, value: Any = None) -> OverlayCell:
+        if row < 1 or column < 1:
+            raise ValueError("Row or column values must be at least 1")
+        self._touch(row, column)
+        cell = OverlayCell(self, row, column)
+        if value is not None:
+            cell.value = value
+        return cell
+
+    def iter_rows(
+        self,
+        min_row: Optional[int] = None,
+        max_row: Optional[int] = None,
+        min_col: Optional[int] = None,
+        max_col: Optional[int] = None,
+        values_only: bool = False,
+    ) -> Iterator[Tuple[Any, ...]]:
+        min_row = min_row or 1
+        min_col = min_col or 1
+        max_row = max_row or self.max_row
+        max_col = max_col or self.max_column
+        columns = range(min_col, max_col + 1)
+        for row in range(min_row, max_row + 1):
+            for column in columns:
+                self._touch(row, column)
+            if values_only:
+                yield tuple(self.value(row, column) for column in columns)
+            else:
+                yield tuple(OverlayCell(self, row, column) for column in columns)
+
+
+class OverlayCells(MutableMapping):
+    """
+    保存叠加表时Sheet3的 _cells：Sheet1的单元格字典加上由补丁生成的单元格，不复制Sheet1的字典
+    超链接在保存时登记到 cell.parent 上，共用的带超链接单元格在取出时复制一份到目标表
+    """
+
+    def __init__(self, source: Dict[Tuple[int, int], Cell], target: Worksheet) -> None:
+        self.source = source
+        self.target = target
+        self.patched: Dict[Tuple[int, int], Cell] = {}
+
+    def __getitem__(self, key: Tuple[int, int]) -> Cell:
+        cell = self.patched.get(key)
+        if cell is not None:
+            return cell
+        cell = self.source[key]
+        if cell.hyperlink:
+            return OverlayWorksheetCopy.copy_cell(cell, self.target, *key)
+        return cell
+
+    def __setitem__(self, key: Tuple[int, int], cell: Cell) -> None:
+        self.patched[key] = cell
+
+    def __delitem__(self, key: Tuple[int, int]) -> None:
+        # 只在保存期间使用，Sheet1的单元格不能删除
+        del self.patched[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.patched or key in self.source
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        yield from self.source
+        for key in self.patched:
+            if key not in self.source:
+                yield key
+
+    def __len__(self) -> int:
+        return len(self.source) + sum(1 for key in self.patched if key not in self.source)
+
+
+class OverlayWorksheetCopy(WorksheetCopy):
+    """
+    由叠加表生成真正的工作表
+    只为补丁中的坐标生成单元格，其余单元格与Sheet1共用（见OverlayCells）；
+    行高列宽、合并单元格和页面设置与 WorksheetCopy 一样从Sheet1复制
+    """
+
+    def __init__(self, overlay: OverlaySheet, target_worksheet: Worksheet) -> None:
+        super().__init__(overlay.source, target_worksheet)
+        self.overlay = overlay
+
+    @staticmethod
+    def copy_cell(source_cell: Optional[Cell], target: Worksheet, row: int, column: int) -> Cell:
+        """按 BulkWorksheetCopy 的方式把Sheet1的单元格复制到目标表，source_cell 为None时生成空单元格"""
+        if source_cell is None:
+            return Cell(target, row, column)
+        style = source_cell._style
+        cell = Cell(target, row, column, None, copy(style) if any(style) else None)
+        cell._value = source_cell._value
+        cell.data_type = source_cell.data_type
+        if source_cell.hyperlink:
+            cell._hyperlink = copy(source_cell.hyperlink)
+        if source_cell.comment:
+            cell.comment = copy(source_cell.comment)
+        return cell
+
+    def _copy_cells(self) -> None:
+        target = self.target
+        source_cells = self.source._cells
+        cells = OverlayCells(source_cells, target)
+        patched = cells.patched
+
+        def patch(row: int, column: int) -> Cell:
+            cell = patched.get((row, column))
+            if cell is None:
+                cell = self.copy_cell(source_cells.get((row, column)), target, row, column)
+                patched[(row, column)] = cell
+            return cell
+
+        for column, rows in self.overlay.created.items():
+            for row in rows:
+                patch(row, column)
+        for column, column_values in self.overlay.values.items():
+            for row, value in column_values.items():
+                patch(row, column).value = value
+        for column, column_fills in self.overlay.fills.items():
+            for row, fill_id in column_fills.items():
+                cell = patch(row, column)
+                if cell._style is None:
+                    cell._style = StyleArray()
+                cell._style.fillId = fill_id
+
+        target._cells = cells
+        target._current_row = max(
+            [self.source._current_row] + [row for row, _ in patched], default=0
+        )
 
 
 class Processor:
@@ -13,6 +263,7 @@ class Processor:
         sheet1_name: str = "Sheet1",
         sheet2_name: str = "Sheet2",
         sheet3_name: str = "Sheet3",
+        overlay: bool = False,
     ) -> None:
         """
         初始化Excel处理器
@@ -20,6 +271,7 @@ class Processor:
         :param sheet1_name: 第一个工作表名称（默认Sheet1）
         :param sheet2_name: 第二个工作表名称（默认Sheet2）
         :param sheet3_name: 第三个工作表名称（默认Sheet3）
+        :param overlay: 叠加模式，匹配时不复制Sheet1，保存时由Sheet1和修改过的列生成Sheet3
         """
         self.file_path: str = file_path
         self.sheet_names: Dict[str, str] = {
@@ -30,7 +282,9 @@ class Processor:
         self.wb: Optional[Workbook] = None
         self.sheet1: Optional[Worksheet] = None
         self.sheet2: Optional[Worksheet] = None
-        self.sheet3: Optional[Worksheet] = None
+        self.sheet3: Optional[Union[Worksheet, OverlaySheet]] = None
+        self.overlay: bool = overlay
+        self._sheet3_index: Optional[int] = None  # 叠加模式下Sheet3在工作簿中的位置
 
         # 加载工作簿和工作表
         self._load_workbook()
@@ -58,39 +312,75 @@ class Processor:
         if self.sheet_names["sheet2"] not in existing_sheets:
             raise ValueError(f"工作表 '{self.sheet_names['sheet2']}' 不存在")
 
-        # 创建或获取sheet3
-        if self.sheet_names["sheet3"] in existing_sheets:
-            self.sheet3 = self.wb[self.sheet_names["sheet3"]]
-        else:
-            self.sheet3 = self.wb.create_sheet(title=self.sheet_names["sheet3"])
-
         # 设置工作表对象
         self.sheet1 = self.wb[self.sheet_names["sheet1"]]
         self.sheet2 = self.wb[self.sheet_names["sheet2"]]
 
-        # 复制sheet1到sheet3
-        self._copy_sheet(self.sheet1, self.sheet3)
+        # 复制sheet1为sheet3（已存在的sheet3被替换）
+        if not self.overlay:
+            self.sheet3 = self._clone_sheet(self.sheet1, self.sheet_names["sheet3"])
+            return
+
+        # 叠加模式：先移除已有的sheet3，保存时在原位置生成
+        if self.sheet_names["sheet3"] in existing_sheets:
+            old_sheet = self.wb[self.sheet_names["sheet3"]]
+            self._sheet3_index = self.wb.index(old_sheet)
+            self.wb.remove(old_sheet)
+        self.sheet3 = OverlaySheet(self.sheet1, self.sheet_names["sheet3"])
 
-    def _copy_sheet(self, source_sheet: Worksheet, target_sheet: Worksheet) -> None:
+    def _clone_sheet(self, source_sheet: Worksheet, title: str) -> Worksheet:
         """
-        复制工作表内容（带格式）
+        一次克隆整个工作表（见BulkWorksheetCopy）
+        值、样式（含数字格式）、合并单元格、行高列宽和页面设置都会被复制；
+        同名工作表已存在时被替换，并保持原来的位置
         :param source_sheet: 源工作表
-        :param target_sheet: 目标工作表
+        :param title: 克隆得到的工作表名称
+        :return: 克隆得到的工作表
         """
-        # 清空目标工作表（如果已有内容）
-        if target_sheet.dimensions:
-            target_sheet.delete_rows(1, target_sheet.max_row)
-            target_sheet.delete_cols(1, target_sheet.max_column)
+        if self.wb is None:
+            raise RuntimeError("工作簿未初始化")
 
-        # 复制所有单元格（带值）
-        for row in source_sheet.iter_rows():
-            row_data: List[Any] = [cell.value for cell in row]
-            target_sheet.append(row_data)
+        target_sheet: Worksheet = self.wb.create_sheet(title=f"{source_sheet.title} Copy")
+        BulkWorksheetCopy(source_sheet, target_sheet).copy_worksheet()
+        if title in self.wb.sheetnames:
+            old_sheet = self.wb[title]
+            index = self.wb.index(old_sheet)
+            self.wb.remove(old_sheet)
+            self.wb.move_sheet(target_sheet, offset=index - self.wb.index(target_sheet))
+        target_sheet.title = title
+        return target_sheet
+
+    @staticmethod
+    def _row_cells(sheet: Worksheet, row: int, label: str) -> Tuple[Cell, ...]:
+        """
+        获取工作表中一行的单元格
+        :param sheet: 工作表
+        :param row: 行号
+        :param label: 报错时显示的工作表名
+        """
+        rows: List[Tuple[Cell, ...]] = list(
+            sheet.iter_rows(min_row=row, max_row=row, values_only=False)
+        )
+        if not rows:
+            raise ValueError(f"{label}中行{row}不存在")
+        return rows[0]
 
-        # 复制列宽
-        for col_letter, col_dim in source_sheet.column_dimensions.items():
-            if col_dim.width is not None:
-                target_sheet.column_dimensions[col_letter].width = col_dim.width
+    @staticmethod
+    def _match_cells(
+        outer_cells: Tuple[Cell, ...], inner_cells: Tuple[Cell, ...]
+    ) -> Iterator[Tuple[Cell, Optional[Cell]]]:
+        """
+        按值匹配两行单元格
+        对inner_cells建立一次 值->位置 的哈希索引（同值取第一个，与list.index一致），
+        然后按顺序遍历outer_cells
+        :return: (outer单元格, 匹配到的inner单元格或None)
+        """
+        positions: Dict[Any, int] = {}
+        for index, cell in enumerate(inner_cells):
+            positions.setdefault(cell.value, index)
+        for cell in outer_cells:
+            match_index = positions.get(cell.value)
+            yield cell, None if match_index is None else inner_cells[match_index]
 
     def left_to_right(
         self,
@@ -109,29 +399,14 @@ class Processor:
         if self.sheet2 is None or self.sheet3 is None:
             raise RuntimeError("工作表未初始化")
 
-        # 获取Sheet2目标行
-        sheet2_row: List[Tuple[Cell, ...]] = list(
-            self.sheet2.iter_rows(min_row=row2, max_row=row2, values_only=False)
-        )
-        if not sheet2_row:
-            raise ValueError(f"Sheet2中行{row2}不存在")
-        sheet2_row_cells: Tuple[Cell, ...] = sheet2_row[0]
-        sheet2_values: List[Any] = [cell.value for cell in sheet2_row_cells]
-
-        # 获取Sheet3目标行
-        sheet3_row: List[Tuple[Cell, ...]] = list(
-            self.sheet3.iter_rows(min_row=row1, max_row=row1, values_only=False)
-        )
-        if not sheet3_row:
-            raise ValueError(f"Sheet3中行{row1}不存在")
-
-        # 遍历Sheet3的目标行
-        for cell in sheet3_row[0]:
-            try:
-                # 查找匹配值在Sheet2中的位置
-                match_index: int = sheet2_values.index(cell.value)
-                on_match(cell, sheet2_row_cells[match_index], self.sheet3, self.sheet2)
-            except ValueError:
+        sheet2_row_cells = self._row_cells(self.sheet2, row2, "Sheet2")
+        sheet3_row_cells = self._row_cells(self.sheet3, row1, "Sheet3")
+
+        # 遍历Sheet3的目标行，在Sheet2中查找匹配值
+        for cell, match_cell in self._match_cells(sheet3_row_cells, sheet2_row_cells):
+            if match_cell is not None:
+                on_match(cell, match_cell, self.sheet3, self.sheet2)
+            else:
                 on_nomatch(cell, self.sheet3, self.sheet2)
 
     def right_to_left(
@@ -151,29 +426,14 @@ class Processor:
         if self.sheet2 is None or self.sheet3 is None:
             raise RuntimeError("工作表未初始化")
 
-        # 获取Sheet3目标行
-        sheet3_row: List[Tuple[Cell, ...]] = list(
-            self.sheet3.iter_rows(min_row=row1, max_row=row1, values_only=False)
-        )
-        if not sheet3_row:
-            raise ValueError(f"Sheet3中行{row1}不存在")
-        sheet3_row_cells: Tuple[Cell, ...] = sheet3_row[0]
-        sheet3_values: List[Any] = [cell.value for cell in sheet3_row_cells]
-
-        # 获取Sheet2目标行
-        sheet2_row: List[Tuple[Cell, ...]] = list(
-            self.sheet2.iter_rows(min_row=row2, max_row=row2, values_only=False)
-        )
-        if not sheet2_row:
-            raise ValueError(f"Sheet2中行{row2}不存在")
-
-        # 遍历Sheet2的目标行
-        for cell in sheet2_row[0]:
-            try:
-                # 查找匹配值在Sheet3中的位置
-                match_index: int = sheet3_values.index(cell.value)
-                on_match(sheet3_row_cells[match_index], cell, self.sheet2, self.sheet3)
-            except ValueError:
+        sheet3_row_cells = self._row_cells(self.sheet3, row1, "Sheet3")
+        sheet2_row_cells = self._row_cells(self.sheet2, row2, "Sheet2")
+
+        # 遍历Sheet2的目标行，在Sheet3中查找匹配值
+        for cell, match_cell in self._match_cells(sheet2_row_cells, sheet3_row_cells):
+            if match_cell is not None:
+                on_match(match_cell, cell, self.sheet2, self.sheet3)
+            else:
                 on_nomatch(cell, self.sheet2, self.sheet3)
 
     def save(self, output_path: Optional[str] = None) -> None:
@@ -185,7 +445,17 @@ class Processor:
             raise RuntimeError("工作簿未初始化")
 
         save_path = output_path if output_path else self.file_path
-        self.wb.save(save_path)
+        if not self.overlay:
+            self.wb.save(save_path)
+            return
+
+        # 叠加模式：临时生成sheet3，保存后移除，补丁保留以便继续处理
+        target_sheet = self.wb.create_sheet(title=self.sheet3.title, index=self._sheet3_index)
+        try:
+            OverlayWorksheetCopy(self.sheet3, target_sheet).copy_worksheet()
+            self.wb.save(save_path)
+        finally:
+            self.wb.remove(target_sheet)
 
     def process(
         self,
@@ -1,3 +1,8 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
 from .core.handers import CopyCloumnHandler
 from .core.processor import Processor
 from pydantic import BaseModel, Field
@@ -11,6 +16,7 @@ class ToolConfig(BaseModel):
     row2: int = Field(..., description="参照表Sheet匹配行", gt=0)
     fp: str = Field(..., description="待处理Excel文件路径")
     max_num: int = Field(2000, description="CopyCloumnHandler处理器最大copy行数", gt=0)
+    overlay: bool = Field(False, description="叠加模式，保存时才由Sheet1生成处理结果Sheet")
 
     class Config:
         # 添加额外的配置，例如字段别名等
@@ -25,6 +31,7 @@ def run_tool_copy_clomun(
         sheet1_name=config.Sheet1_name,
         sheet2_name=config.Sheet2_name,
         sheet3_name=config.Sheet3_name,
+        overlay=config.overlay,
     )
     h = CopyCloumnHandler(config.max_num)
     p.process(
@@ -33,4 +40,150 @@ def run_tool_copy_clomun(
         row2=config.row2,
         on_match=h.my_on_match,
         on_nomatch=h.my_on_nomatch,
-    )
\ No newline at end of file
+    )
+
+
+class CopyClomunJob(BaseModel):
+    """
+    批量模式中的一个匹配任务（一组row1、row2）
+    row1、row2 与 run_tool_copy_clomun 一样原样传给 Processor.process，
+    两者分别对应哪个Sheet随 direction 而变
+    """
+
+    direction: bool = Field(True, description="匹配方向，False表示反转匹配方向")
+    row1: int = Field(
+        ...,
+        description="direction为True时是参照表Sheet的匹配行，为False时是处理结果Sheet的匹配行",
+        gt=0,
+    )
+    row2: int = Field(
+        ...,
+        description="direction为True时是处理结果Sheet的匹配行，为False时是参照表Sheet的匹配行",
+        gt=0,
+    )
+    max_num: int = Field(2000, description="CopyCloumnHandler处理器最大copy行数", gt=0)
+
+    class Config:
+        extra = "forbid"
+
+
+class BatchFileConfig(BaseModel):
+    """批量模式中的一个文件：文件只加载、保存一次，jobs按顺序在同一个处理结果Sheet上执行"""
+
+    fp: str = Field(..., description="待处理Excel文件路径")
+    jobs: List[CopyClomunJob] = Field(..., description="匹配任务列表", min_length=1)
+    Sheet1_name: str = Field("Sheet1", description="待处理Sheet名")
+    Sheet2_name: str = Field("Sheet2", description="参照表Sheet名")
+    Sheet3_name: str = Field("Sheet3", description="处理结果Sheet名")
+    output_fp: Optional[str] = Field(None, description="结果保存路径，None表示覆盖原文件")
+    overlay: bool = Field(False, description="叠加模式，保存时才由Sheet1生成处理结果Sheet")
+
+    class Config:
+        extra = "forbid"
+        str_strip_whitespace = True
+
+
+class BatchJobResult(BaseModel):
+    """批量模式中单个匹配任务的结果"""
+
+    fp: str
+    index: int  # 任务在文件jobs中的序号
+    direction: bool
+    row1: int
+    row2: int
+    matches: int = 0
+    not_matches: int = 0
+
+
+class BatchFileResult(BaseModel):
+    """批量模式中单个文件的结果"""
+
+    fp: str
+    output_fp: str = ""
+    jobs: List[BatchJobResult] = []
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+class BatchResult(BaseModel):
+    """批量运行结果"""
+
+    files: List[BatchFileResult]
+    wall_seconds: float
+
+    def summary(self) -> str:
+        """每个任务的匹配数、不匹配数汇总"""
+        lines = []
+        for file in self.files:
+            status = f"失败: {file.error}" if file.error else f"已保存: {file.output_fp}"
+            lines.append(f"{file.fp} {file.seconds:.2f}秒 {status}")
+            for job in file.jobs:
+                lines.append(
+                    f"  [{job.index}] row1={job.row1} row2={job.row2} "
+                    f"{'正向' if job.direction else '反向'} "
+                    f"匹配{job.matches} 不匹配{job.not_matches}"
+                )
+        lines.append(f"共{len(self.files)}个文件 总耗时{self.wall_seconds:.2f}秒")
+        return "\n".join(lines)
+
+
+def _run_batch_file(config: BatchFileConfig) -> BatchFileResult:
+    """子进程：加载一次工作簿，依次执行所有任务，保存一次"""
+    start = time.perf_counter()
+    result = BatchFileResult(fp=config.fp)
+    try:
+        p = Processor(
+            file_path=config.fp,
+            sheet1_name=config.Sheet1_name,
+            sheet2_name=config.Sheet2_name,
+            sheet3_name=config.Sheet3_name,
+            overlay=config.overlay,
+        )
+        for index, job in enumerate(config.jobs):
+            h = CopyCloumnHandler(job.max_num)
+            p.process(
+                direction=job.direction,
+                row1=job.row1,
+                row2=job.row2,
+                on_match=h.my_on_match,
+                on_nomatch=h.my_on_nomatch,
+            )
+            result.jobs.append(
+                BatchJobResult(
+                    fp=config.fp,
+                    index=index,
+                    direction=job.direction,
+                    row1=job.row1,
+                    row2=job.row2,
+                    matches=len(h.matches),
+                    not_matches=len(h.not_matches),
+                )
+            )
+        result.output_fp = config.output_fp or config.fp
+        p.save(result.output_fp)
+    except Exception as e:
+        # 出错的文件不保存，已执行任务的统计保留
+        result.error = str(e)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def run_tool_copy_clomun_batch(
+    configs: List[BatchFileConfig], max_workers: Optional[int] = None
+) -> BatchResult:
+    """
+    批量运行多个文件的多组匹配任务
+    每个文件只加载一次、克隆一次处理结果Sheet、保存一次，文件之间在进程池中并行；
+    同一文件的任务按顺序在同一个工作簿上执行（xlsx只能由一个写入者整体保存）
+    :param configs: 文件配置列表
+    :param max_workers: 最大进程数，None表示CPU核数
+    :return: 与configs顺序一致的结果
+    """
+    output_paths = [os.path.abspath(config.output_fp or config.fp) for config in configs]
+    if len(set(output_paths)) != len(output_paths):
+        raise ValueError("配置中存在重复的结果保存路径")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        files = list(executor.map(_run_batch_file, configs))
+    return BatchResult(files=files, wall_seconds=time.perf_counter() - start)
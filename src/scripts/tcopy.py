@@ -1,47 +1,501 @@
 import os
-from openpyxl import Workbook
+import posixpath
+import re
+import shutil
+import zipfile
+from typing import BinaryIO, Dict, List, Set, Tuple
 
+# 直接在xlsx压缩包层面复制：不加载单元格，只截取工作表XML中sheetData之外的部分和前N行
+_CHUNK_SIZE = 1 << 20
 
-def tcopy(input_file_path, suffix="_clone", output_path=None):
+_RELS_NS = b"http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_WORKSHEET_TYPE = _RELS_NS + b"/worksheet"
+_SHARED_STRINGS_TYPE = _RELS_NS + b"/sharedStrings"
+_CALC_CHAIN_TYPE = _RELS_NS + b"/calcChain"
+_TABLE_TYPE = _RELS_NS + b"/table"
+_COMMENTS_TYPE = _RELS_NS + b"/comments"
+_VML_DRAWING_TYPE = _RELS_NS + b"/vmlDrawing"
+
+_RELATIONSHIP_RE = re.compile(rb"<(?:\w+:)?Relationship\b[^>]*>")
+_SHEET_DATA_RE = re.compile(rb"<(\w+:)?sheetData\b[^>]*?(/?)>")
+_ROW_RE = re.compile(rb"<(?:\w+:)?row\b[^>]*?(/?)>")
+_ROW_NUMBER_RE = re.compile(rb'\sr="(\d+)"')
+_CELL_RE = re.compile(rb"<((?:\w+:)?)c\b([^>]*?)(?:/>|>(.*?)</\1c>)", re.S)
+_FORMULA_RE = re.compile(rb"<((?:\w+:)?)f\b[^>]*?(?:/>|>.*?</\1f>)", re.S)
+_VALUE_RE = re.compile(rb"<((?:\w+:)?)v>(\d+)</\1v>")
+_DIMENSION_RE = re.compile(rb'(<(?:\w+:)?dimension\b[^>]*?\sref=")([^"]*)(")')
+_CELL_REF_RE = re.compile(rb"([A-Z]+)(\d+)")
+_MERGE_CELLS_RE = re.compile(rb"<((?:\w+:)?)mergeCells\b[^>]*?(?:/>|>(.*?)</\1mergeCells>)", re.S)
+_HYPERLINKS_RE = re.compile(rb"<((?:\w+:)?)hyperlinks\b[^>]*?(?:/>|>(.*?)</\1hyperlinks>)", re.S)
+_REF_ELEMENT_RE = re.compile(rb'<(?:\w+:)?\w+\b[^>]*?\sref="([^"]*)"[^>]*>')
+_SST_START_RE = re.compile(rb"<(\w+:)?sst\b[^>]*?(/?)>")
+_SI_RE = re.compile(rb"<((?:\w+:)?)si\b[^>]*?(?:/>|>.*?</\1si>)", re.S)
+_COUNT_ATTR_RE = re.compile(rb'\s(?:count|uniqueCount)="\d*"')
+_TABLE_RE = re.compile(rb"<(?:\w+:)?table\b[^>]*>")
+_REF_ATTR_RE = re.compile(rb'(\sref=")([^"]*)(")')
+_AUTO_FILTER_RE = re.compile(rb"<(?:\w+:)?autoFilter\b[^>]*>")
+_SORT_STATE_RE = re.compile(rb"<((?:\w+:)?)sortState\b[^>]*?(?:/>|>.*?</\1sortState>)", re.S)
+_COMMENT_RE = re.compile(rb"<((?:\w+:)?)comment\b([^>]*?)(?:/>|>.*?</\1comment>)", re.S)
+_VML_SHAPE_RE = re.compile(rb"<((?:\w+:)?)shape\b[^>]*>.*?</\1shape>", re.S)
+_VML_NOTE_ROW_RE = re.compile(rb'ObjectType="Note".*?<(?:\w+:)?Row>(\d+)<', re.S)
+_TABLE_PARTS_RE = re.compile(rb"<((?:\w+:)?)tableParts\b[^>]*?(?:/>|>(.*?)</\1tableParts>)", re.S)
+_LEGACY_DRAWING_RE = re.compile(rb"<(?:\w+:)?legacyDrawing\b[^>]*>")
+
+
+def _attr(tag: bytes, name: bytes) -> bytes:
+    match = re.search(rb"\s" + name + rb'="([^"]*)"', tag)
+    return match.group(1) if match else b""
+
+
+def _part_path(base: str, target: bytes) -> str:
+    """把关系中的Target转为压缩包内的路径"""
+    target = target.decode("utf-8")
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(base), target))
+
+
+def _workbook_parts(zin: zipfile.ZipFile) -> Tuple[str, List[str], str, str]:
+    """
+    读取 xl/workbook.xml 的关系，找出工作表、共享字符串和计算链
+    :return: (workbook关系文件路径, 工作表路径列表, 共享字符串路径, 计算链路径)
+    """
+    workbook = "xl/workbook.xml"
+    rels_path = "xl/_rels/workbook.xml.rels"
+    if workbook not in zin.NameToInfo or rels_path not in zin.NameToInfo:
+        raise ValueError("不是有效的xlsx文件：缺少 xl/workbook.xml")
+
+    sheets, shared_strings, calc_chain = [], "", ""
+    for tag in _RELATIONSHIP_RE.findall(zin.read(rels_path)):
+        rel_type = _attr(tag, b"Type")
+        path = _part_path(workbook, _attr(tag, b"Target"))
+        if rel_type == _WORKSHEET_TYPE:
+            sheets.append(path)
+        elif rel_type == _SHARED_STRINGS_TYPE:
+            shared_strings = path
+        elif rel_type == _CALC_CHAIN_TYPE:
+            calc_chain = path
+    return rels_path, sheets, shared_strings, calc_chain
+
+
+def _sheet_relationships(
+    zin: zipfile.ZipFile, sheet: str
+) -> Tuple[str, List[Tuple[bytes, bytes, str]]]:
+    """
+    读取工作表的关系
+    :return: (工作表关系文件路径, [(关系Id, 关系类型, 部件路径), ...])，没有关系文件时路径为空
+    """
+    rels_path = posixpath.join(
+        posixpath.dirname(sheet), "_rels", posixpath.basename(sheet) + ".rels"
+    )
+    if rels_path not in zin.NameToInfo:
+        return "", []
+    relationships = []
+    for tag in _RELATIONSHIP_RE.findall(zin.read(rels_path)):
+        if _attr(tag, b"TargetMode") == b"External":
+            continue
+        relationships.append(
+            (_attr(tag, b"Id"), _attr(tag, b"Type"), _part_path(sheet, _attr(tag, b"Target")))
+        )
+    return rels_path, relationships
+
+
+class _ChunkReader:
+    """按块读取压缩包中的一个部件，只在缓冲区中保留尚未处理的部分"""
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self.stream = stream
+        self.buffer = b""
+        self.eof = False
+
+    def fill(self) -> bool:
+        """再读一块，返回是否读到了数据"""
+        if self.eof:
+            return False
+        chunk = self.stream.read(_CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def search(self, pattern: re.Pattern, pos: int = 0) -> re.Match:
+        """在缓冲区中查找，找不到时继续读取，直到读完"""
+        while True:
+            match = pattern.search(self.buffer, pos)
+            if match or not self.fill():
+                return match
+
+    def skip_to(self, token: bytes) -> bool:
+        """丢弃token之前（含token）的数据，不在内存中累积"""
+        while True:
+            index = self.buffer.find(token)
+            if index >= 0:
+                self.buffer = self.buffer[index + len(token):]
+                return True
+            # 保留末尾可能被切断的一段
+            self.buffer = self.buffer[-(len(token) - 1):]
+            if not self.fill():
+                return False
+
+    def rest(self) -> bytes:
+        return self.buffer + self.stream.read()
+
+
+def _split_sheet(stream: BinaryIO, header_rows: int) -> Tuple[bytes, bytes, bytes]:
+    """
+    拆分工作表XML
+    :return: (sheetData之前的部分含开始标签, 行号不超过header_rows的行, 结束标签及之后的部分)
+    """
+    reader = _ChunkReader(stream)
+    match = reader.search(_SHEET_DATA_RE)
+    if match is None:
+        raise ValueError("工作表中缺少 sheetData")
+    prefix = match.group(1) or b""
+    open_tag = b"<" + prefix + b"sheetData>"
+    close_tag = b"</" + prefix + b"sheetData>"
+    head = reader.buffer[: match.start()] + open_tag
+    if match.group(2):  # <sheetData/>
+        return head, b"", close_tag + reader.buffer[match.end():] + reader.stream.read()
+
+    # 行按行号升序排列，遇到第一个超出表头的行即停止
+    pos, row_number, rows = match.end(), 0, []
+    while True:
+        row = reader.search(_ROW_RE, pos)
+        close = reader.buffer.find(close_tag, pos)
+        if row is None or (0 <= close < row.start()):
+            break
+        number = _ROW_NUMBER_RE.search(row.group(0))
+        row_number = int(number.group(1)) if number else row_number + 1
+        if row_number > header_rows:
+            break
+        end = row.end()
+        if not row.group(1):
+            row_close = b"</" + prefix + b"row>"
+            while reader.buffer.find(row_close, end) < 0 and reader.fill():
+                pass
+            end = reader.buffer.index(row_close, end) + len(row_close)
+        rows.append(reader.buffer[pos:end])
+        pos = end
+
+    reader.buffer = reader.buffer[pos:]
+    if not reader.skip_to(close_tag):
+        raise ValueError("工作表中 sheetData 未结束")
+    return head, b"".join(rows), close_tag + reader.rest()
+
+
+def _start_row(ref: bytes) -> int:
+    cell = _CELL_REF_RE.search(ref)
+    return int(cell.group(2)) if cell else 0
+
+
+def _clip_ref(ref: bytes, header_rows: int) -> bytes:
+    """把区域的结束行截到表头范围内，整个区域都在表头之后时返回空"""
+    cells = _CELL_REF_RE.findall(ref)
+    if not cells or int(cells[0][1]) > header_rows:
+        return b""
+    start = cells[0][0] + cells[0][1]
+    if len(cells) == 1:
+        return start
+    end_col, end_row = cells[-1]
+    return start + b":" + end_col + str(min(int(end_row), header_rows)).encode()
+
+
+def _filter_refs(tail: bytes, pattern: re.Pattern, header_rows: int) -> bytes:
+    """去掉合并单元格、超链接中从表头之后开始的项，全部去掉时移除整个元素"""
+
+    def replace(match: re.Match) -> bytes:
+        items = [
+            item.group(0)
+            for item in _REF_ELEMENT_RE.finditer(match.group(2) or b"")
+            if 0 < _start_row(item.group(1)) <= header_rows
+        ]
+        if not items:
+            return b""
+        whole = match.group(0)
+        start = whole[: whole.index(b">") + 1]
+        start = re.sub(rb'\scount="\d*"', b' count="%d"' % len(items), start)
+        name = re.match(rb"<(?:\w+:)?(\w+)", whole).group(1)
+        return start + b"".join(items) + b"</" + match.group(1) + name + b">"
+
+    return pattern.sub(replace, tail)
+
+
+def _trim_table(xml: bytes, header_rows: int) -> bytes:
+    """
+    表格区域截到表头范围内，表格的标题行被去掉时返回空
+    有标题行的表格保留一行空数据行（Excel中的表格至少有一行数据），汇总行随数据行一起去掉
+    """
+    tag = _TABLE_RE.search(xml)
+    if tag is None:
+        return b""
+    start = _start_row(_attr(tag.group(0), b"ref"))
+    if not 0 < start <= header_rows:
+        return b""
+    has_header = _attr(tag.group(0), b"headerRowCount") != b"0"
+    limit = max(header_rows, start + 1) if has_header else header_rows
+
+    def clip(match: re.Match) -> bytes:
+        return _REF_ATTR_RE.sub(
+            lambda m: m.group(1) + _clip_ref(m.group(2), limit) + m.group(3),
+            match.group(0),
+            count=1,
+        )
+
+    table = re.sub(rb'\stotalsRowCount="\d*"', b"", clip(tag))
+    xml = xml[: tag.start()] + table + xml[tag.end():]
+    return _SORT_STATE_RE.sub(b"", _AUTO_FILTER_RE.sub(clip, xml))
+
+
+def _trim_comments(xml: bytes, header_rows: int) -> bytes:
+    """去掉表头之后的批注，全部去掉时返回空"""
+    kept = 0
+
+    def replace(match: re.Match) -> bytes:
+        nonlocal kept
+        if 0 < _start_row(_attr(match.group(2), b"ref")) <= header_rows:
+            kept += 1
+            return match.group(0)
+        return b""
+
+    xml = _COMMENT_RE.sub(replace, xml)
+    return xml if kept else b""
+
+
+def _trim_vml(xml: bytes, header_rows: int) -> bytes:
+    """去掉表头之后的批注框（VML中的行号从0开始），没有剩下任何图形时返回空"""
+    kept = 0
+
+    def replace(match: re.Match) -> bytes:
+        nonlocal kept
+        note = _VML_NOTE_ROW_RE.search(match.group(0))
+        if note and int(note.group(1)) >= header_rows:
+            return b""
+        kept += 1
+        return match.group(0)
+
+    xml = _VML_SHAPE_RE.sub(replace, xml)
+    return xml if kept else b""
+
+
+def _trim_sheet_parts(
+    zin: zipfile.ZipFile, sheet: str, tail: bytes, header_rows: int
+) -> Tuple[bytes, Dict[str, bytes], Set[str]]:
+    """
+    处理工作表关联的表格、批注和批注框：截到表头范围内，不再需要的部件连同关系一起去掉
+    :return: (新的工作表结尾部分, {部件路径: 新内容}, 去掉的部件路径)
+    """
+    rels_path, relationships = _sheet_relationships(zin, sheet)
+    trim = {_TABLE_TYPE: _trim_table, _COMMENTS_TYPE: _trim_comments, _VML_DRAWING_TYPE: _trim_vml}
+    replaced: Dict[str, bytes] = {}
+    dropped: Set[str] = set()
+    dropped_ids: Set[bytes] = set()
+    for rel_id, rel_type, path in relationships:
+        if rel_type not in trim or path not in zin.NameToInfo or path in replaced:
+            continue
+        data = trim[rel_type](zin.read(path), header_rows)
+        if data:
+            replaced[path] = data
+        else:
+            dropped.add(path)
+            dropped_ids.add(rel_id)
+    if not dropped_ids:
+        return tail, replaced, dropped
+
+    def referenced(tag: bytes) -> bool:
+        rel_id = re.search(rb'\s(?:\w+:)?id="([^"]*)"', tag)
+        return rel_id is not None and rel_id.group(1) in dropped_ids
+
+    def replace_table_parts(match: re.Match) -> bytes:
+        items = [
+            item
+            for item in re.findall(rb"<(?:\w+:)?tablePart\b[^>]*>", match.group(2) or b"")
+            if not referenced(item)
+        ]
+        if not items:
+            return b""
+        whole = match.group(0)
+        start = whole[: whole.index(b">") + 1]
+        start = re.sub(rb'\scount="\d*"', b' count="%d"' % len(items), start)
+        return start + b"".join(items) + b"</" + match.group(1) + b"tableParts>"
+
+    tail = _TABLE_PARTS_RE.sub(replace_table_parts, tail)
+    tail = _LEGACY_DRAWING_RE.sub(lambda m: b"" if referenced(m.group(0)) else m.group(0), tail)
+    replaced[rels_path] = b"".join(
+        b"" if _RELATIONSHIP_RE.fullmatch(tag) and _attr(tag, b"Id") in dropped_ids else tag
+        for tag in re.split(rb"(<(?:\w+:)?Relationship\b[^>]*>)", zin.read(rels_path))
+    )
+    return tail, replaced, dropped
+
+
+def _string_indices(rows: bytes) -> Set[int]:
+    """表头行中引用的共享字符串序号"""
+    indices = set()
+    for cell in _CELL_RE.finditer(rows):
+        if _attr(cell.group(2), b"t") == b"s" and cell.group(3):
+            value = _VALUE_RE.search(cell.group(3))
+            if value:
+                indices.add(int(value.group(2)))
+    return indices
+
+
+def _compact_shared_strings(
+    zin: zipfile.ZipFile, path: str, used: Set[int]
+) -> Tuple[Dict[int, int], bytes]:
+    """
+    只保留表头用到的共享字符串，读到最后一个用到的序号即停止
+    :return: (原序号 -> 新序号, 新的共享字符串XML)
+    """
+    if not path:
+        if used:
+            raise ValueError("工作表引用了共享字符串，但文件中没有共享字符串表")
+        return {}, b""
+
+    found: Dict[int, bytes] = {}
+    with zin.open(path) as stream:
+        reader = _ChunkReader(stream)
+        match = reader.search(_SST_START_RE)
+        if match is None:
+            raise ValueError("共享字符串表格式错误")
+        declaration = reader.buffer[: match.start()]
+        prefix, self_closing = match.group(1) or b"", match.group(2)
+        start_tag = _COUNT_ATTR_RE.sub(b"", match.group(0))
+        start_tag = start_tag[: -2 if self_closing else -1].rstrip()
+
+        pos, index, last = match.end(), 0, max(used, default=-1)
+        while not self_closing and index <= last:
+            item = reader.search(_SI_RE, pos)
+            if item is None:
+                break
+            if index in used:
+                found[index] = item.group(0)
+            index += 1
+            pos = item.end()
+            if pos > _CHUNK_SIZE:
+                reader.buffer, pos = reader.buffer[pos:], 0
+
+    missing = used - found.keys()
+    if missing:
+        raise ValueError(f"共享字符串表中缺少第{min(missing)}项")
+    order = sorted(found)
+    count = b' count="%d" uniqueCount="%d">' % (len(order), len(order))
+    sst = (
+        declaration
+        + start_tag
+        + count
+        + b"".join(found[index] for index in order)
+        + b"</" + prefix + b"sst>"
+    )
+    return {old: new for new, old in enumerate(order)}, sst
+
+
+def _sheet_xml(
+    head: bytes, rows: bytes, tail: bytes, string_map: Dict[int, int], header_rows: int
+) -> bytes:
+    """拼出只有表头的工作表XML"""
+
+    def remap_cell(cell: re.Match) -> bytes:
+        prefix, attrs, body = cell.group(1), cell.group(2), cell.group(3)
+        if not body or _attr(attrs, b"t") != b"s":
+            return cell.group(0)
+        body = _VALUE_RE.sub(
+            lambda v: b"<%sv>%d</%sv>" % (v.group(1), string_map[int(v.group(2))], v.group(1)),
+            body,
+        )
+        return b"<" + prefix + b"c" + attrs + b">" + body + b"</" + prefix + b"c>"
+
+    head = _DIMENSION_RE.sub(
+        lambda m: m.group(1) + (_clip_ref(m.group(2), header_rows) or b"A1") + m.group(3),
+        head,
+        count=1,
+    )
+    tail = _filter_refs(tail, _MERGE_CELLS_RE, header_rows)
+    tail = _filter_refs(tail, _HYPERLINKS_RE, header_rows)
+    return head + _CELL_RE.sub(remap_cell, rows) + tail
+
+
+def tcopy(input_file_path, suffix="_clone", output_path=None, header_rows=0):
     """
     复刻Excel文件的所有Sheet（创建空副本）
 
+    直接在压缩包层面处理：工作表只保留前header_rows行，样式、列宽、合并单元格、
+    页面设置等其余部分原样复制，不加载任何单元格，处理大文件时内存占用与文件大小无关。
+    表格区域截到表头范围内（标题行被去掉的表格整个去掉），表头之后的批注一并去掉
+
     参数:
         input_file_path (str): 输入Excel文件路径
         suffix (str): 输出文件名后缀，默认为"_clone"
         output_path (str): 输出路径，默认为输入文件同路径
+        header_rows (int): 保留的表头行数，默认为0（只保留空表）
 
     返回:
         str: 生成的副本文件路径
     """
-    # 加载原始工作簿仅获取sheet名
-    from openpyxl import load_workbook
+    if header_rows < 0:
+        raise ValueError("header_rows 不能小于0")
 
-    original_wb = load_workbook(input_file_path, read_only=True)
-    sheet_names = original_wb.sheetnames
-    original_wb.close()
+    # 确定输出路径和文件名（保留原扩展名，xlsm中的宏一并复制）
+    if output_path is None:
+        output_path = os.path.dirname(input_file_path)
 
-    # 创建新工作簿
-    new_wb = Workbook()
+    original_name, extension = os.path.splitext(os.path.basename(input_file_path))
+    output_filename = f"{original_name}{suffix}{extension or '.xlsx'}"
+    output_file_path = os.path.join(output_path, output_filename)
+    if os.path.abspath(output_file_path) == os.path.abspath(input_file_path):
+        raise ValueError("输出文件不能与输入文件相同")
 
-    # 删除默认创建的Sheet（如果有）
-    if "Sheet" in new_wb.sheetnames:
-        del new_wb["Sheet"]
+    try:
+        zin = zipfile.ZipFile(input_file_path)
+    except zipfile.BadZipFile:
+        raise ValueError(f"不是有效的xlsx文件: {input_file_path}")
 
-    # 创建所有同名Sheet
-    for name in sheet_names:
-        new_wb.create_sheet(name)
+    with zin:
+        rels_path, sheet_paths, shared_strings, calc_chain = _workbook_parts(zin)
 
-    # 确定输出路径和文件名
-    if output_path is None:
-        output_path = os.path.dirname(input_file_path)
+        sheets: Dict[str, Tuple[bytes, bytes, bytes]] = {}
+        used_strings: Set[int] = set()
+        replaced: Dict[str, bytes] = {}
+        dropped: Set[str] = {calc_chain} if calc_chain else set()  # 计算链由Excel重新生成
+        for path in sheet_paths:
+            with zin.open(path) as stream:
+                head, rows, tail = _split_sheet(stream, header_rows)
+            tail, sheet_replaced, sheet_dropped = _trim_sheet_parts(zin, path, tail, header_rows)
+            replaced.update(sheet_replaced)
+            dropped |= sheet_dropped
+            rows = _FORMULA_RE.sub(b"", rows)  # 公式可能引用被去掉的行，只保留计算结果
+            used_strings.update(_string_indices(rows))
+            sheets[path] = (head, rows, tail)
 
-    original_name = os.path.splitext(os.path.basename(input_file_path))[0]
-    output_filename = f"{original_name}{suffix}.xlsx"
-    output_file_path = os.path.join(output_path, output_filename)
+        string_map, sst = _compact_shared_strings(zin, shared_strings, used_strings)
 
-    # 保存新工作簿
-    new_wb.save(output_file_path)
+        with zipfile.ZipFile(output_file_path, "w", zipfile.ZIP_DEFLATED) as zout:
+            for info in zin.infolist():
+                name = info.filename
+                if name in dropped:
+                    continue
+                if name in sheets:
+                    head, rows, tail = sheets[name]
+                    data = _sheet_xml(head, rows, tail, string_map, header_rows)
+                elif name == shared_strings:
+                    data = sst
+                elif name in replaced:
+                    data = replaced[name]
+                elif name == "[Content_Types].xml" and dropped:
+                    data = re.sub(
+                        rb'<(?:\w+:)?Override\b[^>]*PartName="/([^"]*)"[^>]*/>',
+                        lambda m: b"" if m.group(1).decode("utf-8") in dropped else m.group(0),
+                        zin.read(name),
+                    )
+                elif name == rels_path and calc_chain:
+                    data = b"".join(
+                        b"" if _attr(tag, b"Type") == _CALC_CHAIN_TYPE else tag
+                        for tag in re.split(rb"(<(?:\w+:)?Relationship\b[^>]*>)", zin.read(name))
+                    )
+                else:
+                    with zin.open(info) as src, zout.open(info, "w") as dst:
+                        shutil.copyfileobj(src, dst, _CHUNK_SIZE)
+                    continue
+                zout.writestr(info, data)
 
     return output_file_path
 